@@ -2,20 +2,59 @@ from __future__ import annotations
 
 import random
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Sequence
 
 from go_game.engine.game_state import GameState
-from go_game.engine.types import Point
+from go_game.engine.mutable_state import MutableGameState
+from go_game.engine.rules_core import kernel_for, NO_KO, OK
+from go_game.engine.types import Point, EMPTY, COLOR_CODE, points
 
 
 @dataclass(frozen=True, slots=True)
 class RandomAI:
     """
     Picks a random legal move. If no legal moves, returns None (caller can Pass).
+
+    Candidates are drawn from the empty points and checked one at a time
+    with the rules kernel; after `tries` rejections one is drawn from the
+    state's legal move indices instead, so boards with few legal moves
+    still resolve.
     """
+    tries: int = 8
+
+    def pick_move(
+        self, state: GameState | MutableGameState, legal_moves: Optional[Sequence[Point]] = None,
+    ) -> Optional[Point]:
+        """
+        Pick a move for the player to move in `state`.
+        Callers that already hold the state's legal moves can pass them in
+        to pick from directly, without any further legality checks.
+        A MutableGameState is read in place, so playouts can alternate
+        pick_move() and apply_move_inplace() on one state.
+        """
+        if state.is_over:
+            return None
+        if legal_moves is not None:
+            return random.choice(legal_moves) if legal_moves else None
+        if isinstance(state, MutableGameState):
+            grid, size, zobrist = state.grid, state.size, state.zobrist
+        else:
+            board = state.board
+            grid, size, zobrist = board.grid, board.size, board.zobrist
+        empties = [i for i, c in enumerate(grid) if c == EMPTY]
+        if not empties:
+            return None
+        code = COLOR_CODE[state.next_player]
+        ko = state.ko_forbidden_signature
+        ko_hash = NO_KO if ko is None else ko
+        check_move = kernel_for(size)
+        for _ in range(self.tries):
+            idx = random.choice(empties)
+            status, _, _ = check_move(grid, size, idx, code, zobrist, ko_hash)
+            if status == OK:
+                return points(size)[idx]
 
-    def pick_move(self, state: GameState) -> Optional[Point]:
-        moves = state.legal_moves()
-        if not moves:
+        idxs = state.legal_move_indices()
+        if not idxs:
             return None
-        return random.choice(moves)
+        return points(size)[random.choice(idxs)]
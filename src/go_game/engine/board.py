@@ -1,22 +1,118 @@
 from __future__ import annotations
+import random
+import re
 from dataclasses import dataclass
-from typing import Optional, Iterable
+from functools import lru_cache
+from typing import Optional, Iterable, Iterator
 
-from .types import Color, Point, iter_neighbors
+from .types import Color, Point, iter_neighbors, EMPTY, BLACK, WHITE, COLOR_CODE
 
 Stone = Optional[Color]
 
+# Stone value stored for each cell code, indexed by the code itself.
+_CODE_TO_STONE: tuple[Stone, ...] = (None, Color.BLACK, Color.WHITE)
 
-@dataclass(frozen=True, slots=True)
+# bytes.translate tables mapping a cell to b"1" if it holds the code, else b"0".
+_BIT_CHARS: tuple[bytes, ...] = tuple(
+    bytes(0x31 if b == code else 0x30 for b in range(256)) for code in (EMPTY, BLACK, WHITE)
+)
+
+# One-byte grid cells, indexed by cell code, for splicing into a grid.
+_CELL_BYTES: tuple[bytes, ...] = (b"\x00", b"\x01", b"\x02")
+
+
+# Zobrist keys per flat index, indexed by cell code (EMPTY contributes 0).
+# Seeded so hashes are stable across runs; grown on demand for larger boards.
+_ZOBRIST_RNG = random.Random(0x60B0A4D)
+ZOBRIST: list[tuple[int, int, int]] = []
+
+
+def _ensure_zobrist(cells: int) -> None:
+    while len(ZOBRIST) < cells:
+        ZOBRIST.append((0, _ZOBRIST_RNG.getrandbits(64), _ZOBRIST_RNG.getrandbits(64)))
+
+
+def zobrist_hash(grid: bytes) -> int:
+    """Compute the Zobrist hash of a flat grid from scratch."""
+    _ensure_zobrist(len(grid))
+    h = 0
+    for i, code in enumerate(grid):
+        if code:
+            h ^= ZOBRIST[i][code]
+    return h
+
+
+def set_cell(grid: bytes, idx: int, code: int) -> bytes:
+    """
+    Return a copy of ``grid`` with cell ``idx`` set to ``code``.
+    Splices the cell between the two unchanged halves into a new bytes
+    object, without a bytearray round trip.
+    """
+    return grid[:idx] + _CELL_BYTES[code] + grid[idx + 1:]
+
+
+def grid_mask(grid: bytes, code: int) -> int:
+    """Return the bitset of flat indices of ``grid`` holding the given cell code."""
+    return int(grid.translate(_BIT_CHARS[code])[::-1], 2)
+
+
+@lru_cache(maxsize=None)
+def edge_masks(size: int) -> tuple[int, int, int]:
+    """
+    Return (full, not_first_col, not_last_col) bitsets for a ``size`` board.
+    Bit ``i`` stands for flat index ``i``.
+    """
+    full = (1 << (size * size)) - 1
+    first_col = sum(1 << (r * size) for r in range(size))
+    last_col = first_col << (size - 1)
+    return full, full & ~first_col, full & ~last_col
+
+
+def neighbor_bits(bits: int, size: int) -> int:
+    """Return the bitset of points orthogonally adjacent to any point in ``bits``."""
+    full, not_first, not_last = edge_masks(size)
+    return (((bits << 1) & not_first) | ((bits >> 1) & not_last)
+            | ((bits << size) & full) | (bits >> size)) & ~bits
+
+
+def iter_bits(bits: int) -> Iterable[int]:
+    """Yield the flat indices set in ``bits`` in ascending order."""
+    digits = bin(bits)[:1:-1]
+    i = digits.find("1")
+    while i >= 0:
+        yield i
+        i = digits.find("1", i + 1)
+
+
+# Matches any non-empty (non-zero) cell byte.
+_NONZERO_CELL = re.compile(rb"[^\x00]")
+
+
+def changed_indices(a: bytes, b: bytes) -> Iterator[int]:
+    """
+    Yield, in ascending order, the flat indices where two grids of the
+    same length differ. The grids are XORed as big ints, and the
+    non-zero bytes of the result are found by a regex scan.
+    """
+    diff = int.from_bytes(a, "big") ^ int.from_bytes(b, "big")
+    if not diff:
+        return iter(())
+    return (m.start() for m in _NONZERO_CELL.finditer(diff.to_bytes(len(a), "big")))
+
+
+@dataclass(frozen=True, slots=True, eq=False)
 class Board:
     """
     Represents an immutable Go board.
 
-    The board stores stones on a square grid and provides utility
-    methods for reading positions and producing a board signature.
+    The board stores stones in a flat ``bytes`` buffer of length
+    ``size * size`` (row-major), using 0/1/2 for empty/black/white,
+    together with its Zobrist hash, which is updated incrementally
+    and used as the board signature.
     """
     size: int
-    grid: tuple[tuple[Stone, ...], ...]
+    grid: bytes
+    zobrist: int = 0
 
     @staticmethod
     def empty(size: int) -> "Board":
@@ -31,8 +127,46 @@ class Board:
         """
         if size < 2:
             raise ValueError("Board size must be >= 2")
-        row = tuple([None] * size)
-        return Board(size=size, grid=tuple([row for _ in range(size)]))
+        _ensure_zobrist(size * size)
+        return Board(size=size, grid=bytes(size * size))
+
+    @staticmethod
+    def from_grid(size: int, grid: bytes) -> "Board":
+        """
+        Create a board from an existing flat grid, computing its hash.
+        Args:
+            size: Board dimension.
+            grid: Row-major cell codes of length ``size * size``.
+        Returns:
+            A new Board instance.
+        Raises:
+            ValueError: If the grid length does not match the size.
+        """
+        if len(grid) != size * size:
+            raise ValueError("Grid length does not match board size")
+        return Board(size, bytes(grid), zobrist_hash(grid))
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Compare boards by Zobrist hash first; the grids are only compared
+        when the hashes match, to rule out collisions.
+        """
+        if not isinstance(other, Board):
+            return NotImplemented
+        return self.zobrist == other.zobrist and self.size == other.size and self.grid == other.grid
+
+    def __hash__(self) -> int:
+        return hash(self.zobrist)
+
+    def index(self, p: Point) -> int:
+        """
+        Return the flat buffer index of a board point.
+        Args:
+            p: Board point.
+        Returns:
+            The row-major index of the point in ``grid``.
+        """
+        return p.row * self.size + p.col
 
     def get(self, p: Point) -> Stone:
         """
@@ -42,7 +176,7 @@ class Board:
         Returns:
             The stone color at the point, or None if the point is empty.
         """
-        return self.grid[p.row][p.col]
+        return _CODE_TO_STONE[self.grid[p.row * self.size + p.col]]
 
     def place(self, p: Point, color: Color) -> "Board":
         """
@@ -53,22 +187,34 @@ class Board:
         Returns:
             A new Board instance with the stone placed.
         """
-        new_rows = [list(r) for r in self.grid]
-        new_rows[p.row][p.col] = color
-        return Board(self.size, tuple(tuple(r) for r in new_rows))
+        idx = p.row * self.size + p.col
+        code = COLOR_CODE[color]
+        return Board(self.size, set_cell(self.grid, idx, code), self.zobrist ^ ZOBRIST[idx][code])
 
-    def remove_many(self, points: Iterable[Point]) -> "Board":
+    def remove_many(self, mask: int) -> "Board":
         """
         Remove multiple stones from the board.
         Args:
-            points: Iterable of board points to clear.
+            mask: Bitset of the flat indices to clear.
         Returns:
             A new Board instance with the specified points emptied.
         """
-        new_rows = [list(r) for r in self.grid]
-        for p in points:
-            new_rows[p.row][p.col] = None
-        return Board(self.size, tuple(tuple(r) for r in new_rows))
+        ba = bytearray(self.grid)
+        h = self.zobrist
+        for i in iter_bits(mask):
+            h ^= ZOBRIST[i][ba[i]]
+            ba[i] = EMPTY
+        return Board(self.size, bytes(ba), h)
+
+    def mask(self, code: int) -> int:
+        """
+        Return the bitset of points holding the given cell code.
+        Args:
+            code: EMPTY, BLACK or WHITE.
+        Returns:
+            An int with bit ``i`` set when ``grid[i] == code``.
+        """
+        return grid_mask(self.grid, code)
 
     def iter_neighbors(self, p: Point):
         """
@@ -80,9 +226,9 @@ class Board:
         """
         return iter_neighbors(p, self.size)
 
-    def signature(self) -> tuple:
+    def signature(self) -> int:
         """
-        Return a hashable board signature.
+        Return a hashable board signature (the Zobrist hash).
         This signature is used for ko comparison.
         """
-        return self.grid
+        return self.zobrist
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+from .types import Color, Point, EMPTY, BLACK, WHITE, COLOR_CODE, neighbor_table
+from .board import Board, neighbor_bits, iter_bits
+from . import rules
+from .rules import MoveResult
+from .rules_core import flood, kernel_for, ERR_KO
+
+
+@dataclass(frozen=True, slots=True)
+class Chain:
+    """
+    A connected group of same-colored stones.
+
+    Attributes:
+        color: Cell code of the stones (BLACK or WHITE).
+        stones: Bitset of the flat indices of the stones in the chain.
+        liberties: Bitset of the empty points adjacent to the chain.
+    """
+    color: int
+    stones: int
+    liberties: int
+
+
+@dataclass(frozen=True, slots=True)
+class ChainTable:
+    """
+    Persistent string table mapping every stone to its chain.
+
+    Playing a move produces a new table in which only the chains touched by
+    the move (merged, captured or losing/gaining a liberty) are rebuilt;
+    every other Chain instance is shared with the previous table.
+
+    Attributes:
+        chain_of: Chain id per flat index, or -1 for an empty point.
+        chains: Chain id -> Chain.
+        next_id: Id assigned to the next chain created.
+    """
+    chain_of: tuple[int, ...]
+    chains: dict[int, Chain]
+    next_id: int
+
+    @staticmethod
+    def from_board(board: Board) -> "ChainTable":
+        """
+        Build the table from scratch by flood-filling every chain on the board.
+        Used for fresh games and for states created without a table.
+        """
+        grid, size = board.grid, board.size
+        masks = (board.mask(EMPTY), board.mask(BLACK), board.mask(WHITE))
+        chain_of = [-1] * len(grid)
+        chains: dict[int, Chain] = {}
+        for i, code in enumerate(grid):
+            if code != EMPTY and chain_of[i] < 0:
+                grp = flood(1 << i, masks[code], size)
+                cid = len(chains)
+                for j in iter_bits(grp):
+                    chain_of[j] = cid
+                chains[cid] = Chain(code, grp, neighbor_bits(grp, size) & masks[EMPTY])
+        return ChainTable(tuple(chain_of), chains, len(chains))
+
+    def apply_move(
+        self,
+        board: Board,
+        p: Point,
+        color: Color,
+        *,
+        ko_forbidden_signature: Optional[int] = None,
+    ) -> tuple[MoveResult, "ChainTable"]:
+        """
+        Apply a move with rules.apply_move and return its MoveResult
+        together with the updated table for the resulting position.
+
+        Legality is left to the shared rules kernel; the table only
+        relabels the chains the move touched.
+        """
+        result = rules.apply_move(board, p, color, ko_forbidden_signature=ko_forbidden_signature)
+        captured = 0
+        for q in result.captured_points:
+            captured |= 1 << board.index(q)
+        idx = board.index(p)
+        return result, self.after_move(result.board.grid, board.size, idx, COLOR_CODE[color], captured)
+
+    def after_move(
+        self, grid: bytes | bytearray, size: int, idx: int, own: int, captured: int,
+    ) -> "ChainTable":
+        """
+        Return the table for the position after a legal move.
+
+        `grid` is the position after stone `own` was placed at `idx` and
+        the `captured` bitset removed, so callers that play in place can
+        update the table from their own buffer.
+        """
+        chain_of, chains = self.chain_of, self.chains
+        placed = 1 << idx
+        nbrs = neighbor_table(size)
+
+        empties = 0
+        own_ids: set[int] = set()
+        opp_ids: set[int] = set()
+        for nb in nbrs[idx]:
+            s = grid[nb]
+            if (captured >> nb) & 1:
+                opp_ids.add(chain_of[nb])
+            elif s == EMPTY:
+                empties |= 1 << nb
+            elif s == own:
+                own_ids.add(chain_of[nb])
+            else:
+                opp_ids.add(chain_of[nb])
+
+        new_of = list(chain_of)
+        new_chains = dict(chains)
+
+        # The merged chain keeps the id of the largest friendly neighbour so
+        # only the stones of the smaller chains need relabelling.
+        merged_id = max(own_ids, key=lambda cid: chains[cid].stones.bit_count(), default=self.next_id)
+        relabel = placed
+        stones = placed
+        libs = empties
+        for cid in own_ids:
+            ch = new_chains.pop(cid)
+            if cid != merged_id:
+                relabel |= ch.stones
+            stones |= ch.stones
+            libs |= ch.liberties
+        libs &= ~placed
+        for s in iter_bits(relabel):
+            new_of[s] = merged_id
+        new_chains[merged_id] = Chain(own, stones, libs)
+
+        for cid in opp_ids:
+            ch = new_chains[cid]
+            if ch.stones & captured:
+                del new_chains[cid]
+            else:
+                new_chains[cid] = Chain(ch.color, ch.stones, ch.liberties & ~placed)
+
+        if captured:
+            freed: dict[int, int] = {}
+            for s in iter_bits(captured):
+                new_of[s] = -1
+                for nb in nbrs[s]:
+                    if grid[nb] == own:
+                        freed[new_of[nb]] = freed.get(new_of[nb], 0) | (1 << s)
+            for cid, gained in freed.items():
+                ch = new_chains[cid]
+                new_chains[cid] = Chain(ch.color, ch.stones, ch.liberties | gained)
+
+        return ChainTable(tuple(new_of), new_chains, self.next_id + 1)
+
+    def legal_points(
+        self,
+        grid: bytes | bytearray,
+        size: int,
+        zobrist: int,
+        color: Color,
+        *,
+        ko_forbidden_signature: Optional[int] = None,
+    ) -> list[int]:
+        """
+        Compute the flat indices of every legal move for `color` on the
+        position `grid` (hash `zobrist`) that this table describes.
+
+        Legality of each empty point is derived from its neighbours' cached
+        chains:
+        - capture if an adjacent enemy chain has exactly one liberty
+        - suicide if there is no empty neighbour, no capture, and every
+          adjacent friendly chain has only the liberty being filled
+        - ko can only be recreated by a capturing move, so only those
+          candidates are re-checked with the check_move kernel when a ko signature is set
+        """
+        chain_of, chains = self.chain_of, self.chains
+        own = COLOR_CODE[color]
+        nbrs = neighbor_table(size)
+        legal: list[int] = []
+        for i in range(size * size):
+            if grid[i] != EMPTY:
+                continue
+            breathes = captures = False
+            for nb in nbrs[i]:
+                s = grid[nb]
+                if s == EMPTY:
+                    breathes = True
+                elif s == own:
+                    if chains[chain_of[nb]].liberties.bit_count() > 1:
+                        breathes = True
+                elif chains[chain_of[nb]].liberties.bit_count() == 1:
+                    captures = True
+            if not (breathes or captures):
+                continue
+            if captures and ko_forbidden_signature is not None:
+                status, _, _ = kernel_for(size)(grid, size, i, own, zobrist, ko_forbidden_signature)
+                if status == ERR_KO:
+                    continue
+            legal.append(i)
+        return legal
@@ -1,14 +1,27 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Optional
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
 
-from .types import Color, Point
+from .types import Color, Point, COLOR_CODE, points
 from .board import Board
-from .rules import apply_move
-from .errors import GoError
+from .chains import ChainTable
+from .rules_core import move_hash, unwrite_move
 from .scoring import evaluate_territory, ScoreBreakdown
 
 
+# Transposition table of legal moves (as flat indices and as points), keyed
+# by (zobrist, next player, ko signature) and storing the board to rule out
+# hash collisions. States that reach the same position (undo/redo, replays,
+# transpositions) share one legality scan. Kept in least-recently-used order
+# and trimmed to _TT_LIMIT entries. The GUI fills it from both the Tk thread
+# and the AI worker, so every access holds _TT_LOCK.
+_TT: OrderedDict[tuple[int, Color, Optional[int]], tuple[Board, tuple[int, ...], tuple[Point, ...]]] = OrderedDict()
+_TT_LIMIT = 256
+_TT_LOCK = threading.Lock()
+
+
 @dataclass(frozen=True, slots=True)
 class MoveRecord:
     """
@@ -24,33 +37,99 @@ class MoveRecord:
     captured: int
 
 
+@dataclass(frozen=True, slots=True, eq=False)
+class HistoryNode:
+    """
+      One link of the persistent move history (newest move first).
+
+      Appending a move creates a single node pointing at the previous
+      history, so successive game states share their common tail.
+      Nodes compare by identity.
+
+      Attributes:
+          record: The move stored in this node.
+          parent: History before this move, or None for the first move.
+    """
+    record: MoveRecord
+    parent: Optional["HistoryNode"] = None
+
+
+@dataclass(frozen=True, slots=True)
+class MoveDelta:
+    """
+      What a single play or pass changed, enough to step a GameState
+      back with GameState.revert() or forward again by replaying `point`.
+
+      Attributes:
+          point: Board point of the move, or None for a pass.
+          captured: Bitset of the stones captured by the move.
+          prev_ko: Ko signature before the move.
+          prev_last_move: Last move before the move.
+          prev_passes: Consecutive passes before the move.
+    """
+    point: Optional[Point]
+    captured: int
+    prev_ko: Optional[int]
+    prev_last_move: Optional[Point]
+    prev_passes: int
+
+    @staticmethod
+    def between(before: "GameState", after: "GameState") -> "MoveDelta":
+        """
+           Describe the move that turned `before` into `after`, which must
+           be before.play(...) or before.pass_turn().
+        """
+        point = after.history.record.point
+        captured = 0
+        if point is not None:
+            enemy = COLOR_CODE[after.next_player]
+            captured = before.board.mask(enemy) & ~after.board.mask(enemy)
+        return MoveDelta(
+            point, captured, before.ko_forbidden_signature,
+            before.last_move, before.consecutive_passes,
+        )
+
+
 @dataclass(frozen=True, slots=True)
 class GameState:
     """
       Represents an immutable snapshot of a Go game.
 
       Stores board state, current player, captures, pass counters,
-      ko restrictions, and move history.
+      ko restrictions, and move history. The chain table for the board is
+      carried from move to move and rebuilt from the board when missing.
+
+      Ko is the simple rule: `ko_forbidden_signature` holds the Zobrist
+      hash of the one position a single-stone capture may not recreate,
+      so checking it is one int comparison and no board snapshots are
+      kept in the history.
     """
     board: Board
     next_player: Color
     captures_black: int
     captures_white: int
-    ko_forbidden_signature: Optional[tuple] = None
+    ko_forbidden_signature: Optional[int] = None
     last_move: Optional[Point] = None
 
     consecutive_passes: int = 0
     is_over: bool = False
 
-    history: tuple[MoveRecord, ...] = ()
+    history: Optional[HistoryNode] = field(default=None, compare=False)
+    moves_total: int = 0
+    passes_total: int = 0
+
+    chains: Optional[ChainTable] = field(default=None, compare=False, repr=False)
+    _legal: Optional[tuple[Point, ...]] = field(default=None, init=False, compare=False, repr=False)
+    _legal_idx: Optional[tuple[int, ...]] = field(default=None, init=False, compare=False, repr=False)
 
     @staticmethod
     def new(size: int = 19, next_player: Color = Color.BLACK) -> "GameState":
         """
            Create a new game state with an empty board.
         """
+        board = Board.empty(size)
         return GameState(
-            board=Board.empty(size),
+            board=board,
             next_player=next_player,
             captures_black=0,
             captures_white=0,
@@ -58,9 +137,27 @@ class GameState:
             last_move=None,
             consecutive_passes=0,
             is_over=False,
-            history=(),
+            history=None,
+            moves_total=0,
+            passes_total=0,
+            chains=ChainTable.from_board(board),
         )
 
+    @property
+    def zobrist(self) -> int:
+        """
+        Zobrist hash of the board position, maintained incrementally by
+        play(). Cheap key for caches; confirm matches by comparing the
+        boards themselves.
+        """
+        return self.board.zobrist
+
+    def chain_table(self) -> ChainTable:
+        """Return the chain table for the board, rebuilding it if missing."""
+        if self.chains is None:
+            object.__setattr__(self, "chains", ChainTable.from_board(self.board))
+        return self.chains
+
     def play(self, p: Point) -> "GameState":
         """
             Play a stone at the given board point.
@@ -71,7 +168,7 @@ class GameState:
 
         prev_signature = self.board.signature()
 
-        res = apply_move(
+        res, chains = self.chain_table().apply_move(
             self.board,
             p,
             self.next_player,
@@ -86,7 +183,7 @@ class GameState:
 
         new_ko = prev_signature if res.captured == 1 else None
 
-        new_hist = self.history + (MoveRecord(self.next_player, p, res.captured),)
+        new_hist = HistoryNode(MoveRecord(self.next_player, p, res.captured), self.history)
 
         return GameState(
             board=res.board,
@@ -98,6 +195,9 @@ class GameState:
             consecutive_passes=0,
             is_over=False,
             history=new_hist,
+            moves_total=self.moves_total + 1,
+            passes_total=self.passes_total,
+            chains=chains,
         )
 
     def pass_turn(self) -> "GameState":
@@ -108,7 +208,7 @@ class GameState:
         new_passes = self.consecutive_passes + 1
         over = new_passes >= 2
 
-        new_hist = self.history + (MoveRecord(self.next_player, None, 0),)
+        new_hist = HistoryNode(MoveRecord(self.next_player, None, 0), self.history)
 
         return GameState(
             board=self.board,
@@ -120,28 +220,105 @@ class GameState:
             consecutive_passes=new_passes,
             is_over=over,
             history=new_hist,
+            moves_total=self.moves_total + 1,
+            passes_total=self.passes_total + 1,
+            chains=self.chains,
+        )
+
+    def revert(self, delta: MoveDelta) -> "GameState":
+        """
+            Step back over the most recent move, described by `delta`.
+            Returns a state equal to the one the move was played from; its
+            chain table is rebuilt lazily.
+        """
+        mover = self.next_player.opponent
+        board = self.board
+        cb, cw = self.captures_black, self.captures_white
+        if delta.point is not None:
+            idx = board.index(delta.point)
+            code = COLOR_CODE[mover]
+            ba = bytearray(board.grid)
+            unwrite_move(ba, idx, code, delta.captured)
+            board = Board(board.size, bytes(ba), move_hash(board.zobrist, idx, code, delta.captured))
+            n = delta.captured.bit_count()
+            if mover is Color.BLACK:
+                cb -= n
+            else:
+                cw -= n
+
+        return GameState(
+            board=board,
+            next_player=mover,
+            captures_black=cb,
+            captures_white=cw,
+            ko_forbidden_signature=delta.prev_ko,
+            last_move=delta.prev_last_move,
+            consecutive_passes=delta.prev_passes,
+            is_over=False,
+            history=self.history.parent,
+            moves_total=self.moves_total - 1,
+            passes_total=self.passes_total - (delta.point is None),
+            chains=self.chains if delta.point is None else None,
         )
 
     def legal_moves(self) -> list[Point]:
-        """Compute all legal moves for the next player."""
+        """
+        Compute all legal moves for the next player.
+        The result is memoized on the (immutable) state.
+        """
+        return list(self.legal_move_tuple())
+
+    def legal_move_tuple(self) -> tuple[Point, ...]:
+        """
+        Legal moves for the next player as the memoized tuple itself,
+        for callers that only read it and can skip the list copy.
+        """
         if self.is_over:
-            return []
-        size = self.board.size
-        moves: list[Point] = []
-        for r in range(size):
-            for c in range(size):
-                p = Point(r, c)
-                if self.board.get(p) is not None:
-                    continue
-                try:
-                    _ = apply_move(
-                        self.board, p, self.next_player,
-                        ko_forbidden_signature=self.ko_forbidden_signature
-                    )
-                    moves.append(p)
-                except GoError:
-                    pass
-        return moves
+            return ()
+        if self._legal is None:
+            self._memoize_legal()
+        return self._legal
+
+    def legal_move_indices(self) -> tuple[int, ...]:
+        """
+        Flat board indices (row * size + col) of the legal moves for the
+        next player, ascending. Memoized like legal_move_tuple().
+        """
+        if self.is_over:
+            return ()
+        if self._legal_idx is None:
+            self._memoize_legal()
+        return self._legal_idx
+
+    def _memoize_legal(self) -> None:
+        """
+        Fill both legal move memos, from the module transposition table
+        when another state already saw this position.
+        """
+        board = self.board
+        key = (board.zobrist, self.next_player, self.ko_forbidden_signature)
+        with _TT_LOCK:
+            hit = _TT.get(key)
+            if hit is not None and hit[0] == board:
+                _TT.move_to_end(key)
+            else:
+                hit = None
+        if hit is not None:
+            _, idx, legal = hit
+        else:
+            idx = tuple(self.chain_table().legal_points(
+                board.grid, board.size, board.zobrist, self.next_player,
+                ko_forbidden_signature=self.ko_forbidden_signature,
+            ))
+            pts = points(board.size)
+            legal = tuple(pts[i] for i in idx)
+            with _TT_LOCK:
+                _TT[key] = (board, idx, legal)
+                _TT.move_to_end(key)
+                if len(_TT) > _TT_LIMIT:
+                    _TT.popitem(last=False)
+        object.__setattr__(self, "_legal_idx", idx)
+        object.__setattr__(self, "_legal", legal)
 
     def score(self) -> ScoreBreakdown:
         """
@@ -156,13 +333,20 @@ class GameState:
             territory_white=terr.territory_white,
         )
 
+    def iter_history(self) -> Iterator[MoveRecord]:
+        """Iterate over the move history, oldest move first."""
+        records = []
+        node = self.history
+        while node is not None:
+            records.append(node.record)
+            node = node.parent
+        return reversed(records)
+
     def stats(self) -> dict[str, int]:
         """Simple session statistics."""
-        moves = len(self.history)
-        passes = sum(1 for m in self.history if m.point is None)
         return {
-            "moves_total": moves,
-            "passes_total": passes,
+            "moves_total": self.moves_total,
+            "passes_total": self.passes_total,
             "captures_black": self.captures_black,
             "captures_white": self.captures_white,
         }
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .types import Color, Point, COLOR_CODE, points
+from .board import Board
+from .chains import ChainTable
+from .errors import OccupiedPoint, SuicideMove, KoViolation
+from .game_state import GameState, HistoryNode, MoveRecord
+from .rules import check_bounds
+from .rules_core import (
+    play_inplace, unwrite_move, NO_KO, ERR_OCCUPIED, ERR_SUICIDE, ERR_KO,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class UndoEntry:
+    """
+      Everything needed to take back one move of a MutableGameState.
+
+      Attributes:
+          idx: Flat index of the played stone, or -1 for a pass.
+          captured: Bitset of the stones captured by the move.
+          prev_zobrist: Board hash before the move.
+          prev_ko: Ko signature before the move.
+          prev_last_move: Last move before the move.
+          prev_passes: Consecutive passes before the move.
+          prev_chains: Chain table of the previous position, if it was built.
+    """
+    idx: int
+    captured: int
+    prev_zobrist: int
+    prev_ko: Optional[int]
+    prev_last_move: Optional[Point]
+    prev_passes: int
+    prev_chains: Optional[ChainTable]
+
+
+@dataclass(slots=True)
+class MutableGameState:
+    """
+      Mutable game state for AI playouts and replays.
+
+      Shares the rules kernel with GameState but plays moves in place on a
+      bytearray board and keeps an undo stack, so a playout step allocates
+      no new board or state objects. The immutable GameState remains the
+      type used by the UI; convert with from_state()/to_state().
+    """
+    size: int
+    grid: bytearray
+    next_player: Color = Color.BLACK
+    zobrist: int = 0
+    captures_black: int = 0
+    captures_white: int = 0
+    ko_forbidden_signature: Optional[int] = None
+    last_move: Optional[Point] = None
+    consecutive_passes: int = 0
+    is_over: bool = False
+
+    history: list[MoveRecord] = field(default_factory=list)
+    undo_stack: list[UndoEntry] = field(default_factory=list, repr=False)
+    _chains: Optional[ChainTable] = field(default=None, repr=False)
+
+    @staticmethod
+    def new(size: int = 19, next_player: Color = Color.BLACK) -> "MutableGameState":
+        """
+           Create a new mutable game state with an empty board.
+        """
+        board = Board.empty(size)
+        return MutableGameState(size=size, grid=bytearray(board.grid), next_player=next_player)
+
+    @staticmethod
+    def from_state(state: GameState) -> "MutableGameState":
+        """
+           Create a mutable copy of an immutable game state.
+        """
+        return MutableGameState(
+            size=state.board.size,
+            grid=bytearray(state.board.grid),
+            next_player=state.next_player,
+            zobrist=state.board.zobrist,
+            captures_black=state.captures_black,
+            captures_white=state.captures_white,
+            ko_forbidden_signature=state.ko_forbidden_signature,
+            last_move=state.last_move,
+            consecutive_passes=state.consecutive_passes,
+            is_over=state.is_over,
+            history=list(state.iter_history()),
+            _chains=state.chains,
+        )
+
+    def board(self) -> Board:
+        """Return an immutable snapshot of the current board."""
+        return Board(self.size, bytes(self.grid), self.zobrist)
+
+    def to_state(self) -> GameState:
+        """
+           Freeze the current position into an immutable GameState.
+           The chain table is rebuilt lazily by the new state.
+        """
+        node: Optional[HistoryNode] = None
+        for rec in self.history:
+            node = HistoryNode(rec, node)
+        return GameState(
+            board=self.board(),
+            next_player=self.next_player,
+            captures_black=self.captures_black,
+            captures_white=self.captures_white,
+            ko_forbidden_signature=self.ko_forbidden_signature,
+            last_move=self.last_move,
+            consecutive_passes=self.consecutive_passes,
+            is_over=self.is_over,
+            history=node,
+            moves_total=len(self.history),
+            passes_total=sum(1 for m in self.history if m.point is None),
+            chains=self._chains,
+        )
+
+    def play(self, p: Point) -> None:
+        """
+            Play a stone at the given board point, in place.
+            Raises the same GoError subclasses as GameState.play.
+        """
+        if self.is_over:
+            return
+        check_bounds(self.size, p)
+        color = self.next_player
+        idx = p.row * self.size + p.col
+        prev_zobrist = self.zobrist
+        status, captured, h = play_inplace(
+            self.grid, self.size, idx, COLOR_CODE[color], prev_zobrist,
+            NO_KO if self.ko_forbidden_signature is None else self.ko_forbidden_signature,
+        )
+        if status == ERR_OCCUPIED:
+            raise OccupiedPoint(f"Point already occupied: {p}")
+        if status == ERR_SUICIDE:
+            raise SuicideMove(f"Suicide move at {p} for {color}")
+        if status == ERR_KO:
+            raise KoViolation("Ko rule violation: recreates forbidden position")
+
+        n = captured.bit_count()
+        self.undo_stack.append(UndoEntry(
+            idx, captured, prev_zobrist, self.ko_forbidden_signature,
+            self.last_move, self.consecutive_passes, self._chains,
+        ))
+        if color is Color.BLACK:
+            self.captures_black += n
+        else:
+            self.captures_white += n
+        self.zobrist = h
+        self.ko_forbidden_signature = prev_zobrist if n == 1 else None
+        self.last_move = p
+        self.consecutive_passes = 0
+        self.next_player = color.opponent
+        self.history.append(MoveRecord(color, p, n))
+        if self._chains is not None:
+            self._chains = self._chains.after_move(self.grid, self.size, idx, COLOR_CODE[color], captured)
+
+    def pass_turn(self) -> None:
+        """Player passes, in place. Two consecutive passes end the game."""
+        if self.is_over:
+            return
+        self.undo_stack.append(UndoEntry(
+            -1, 0, self.zobrist, self.ko_forbidden_signature,
+            self.last_move, self.consecutive_passes, self._chains,
+        ))
+        self.history.append(MoveRecord(self.next_player, None, 0))
+        self.next_player = self.next_player.opponent
+        self.ko_forbidden_signature = None
+        self.last_move = None
+        self.consecutive_passes += 1
+        self.is_over = self.consecutive_passes >= 2
+
+    def apply_move_inplace(self, move: Optional[Point]) -> Optional[UndoEntry]:
+        """
+            Play `move` (None = pass) in place and return its undo record,
+            for search code that makes and unmakes moves along a line.
+            Returns None when the game is already over and nothing changed.
+            Raises the same GoError subclasses as play().
+        """
+        if self.is_over:
+            return None
+        if move is None:
+            self.pass_turn()
+        else:
+            self.play(move)
+        return self.undo_stack[-1]
+
+    def undo(self, record: Optional[UndoEntry] = None) -> None:
+        """
+            Take back the most recent play or pass.
+            When `record` is given it must be that move's record, as
+            returned by apply_move_inplace(); otherwise ValueError is raised.
+            Raises IndexError if there is nothing to undo.
+        """
+        if record is not None and (not self.undo_stack or self.undo_stack[-1] is not record):
+            raise ValueError("Only the most recent move can be undone")
+        entry = self.undo_stack.pop()
+        self.history.pop()
+        color = self.next_player.opponent
+        if entry.idx >= 0:
+            unwrite_move(self.grid, entry.idx, COLOR_CODE[color], entry.captured)
+            n = entry.captured.bit_count()
+            if color is Color.BLACK:
+                self.captures_black -= n
+            else:
+                self.captures_white -= n
+        self.next_player = color
+        self.zobrist = entry.prev_zobrist
+        self.ko_forbidden_signature = entry.prev_ko
+        self.last_move = entry.prev_last_move
+        self.consecutive_passes = entry.prev_passes
+        self.is_over = False
+        self._chains = entry.prev_chains
+
+    def legal_moves(self) -> list[Point]:
+        """Compute all legal moves for the next player."""
+        pts = points(self.size)
+        return [pts[i] for i in self.legal_move_indices()]
+
+    def legal_move_indices(self) -> list[int]:
+        """Compute the flat board indices of all legal moves for the next player."""
+        if self.is_over:
+            return []
+        if self._chains is None:
+            self._chains = ChainTable.from_board(self.board())
+        return self._chains.legal_points(
+            self.grid, self.size, self.zobrist, self.next_player,
+            ko_forbidden_signature=self.ko_forbidden_signature,
+        )
@@ -1,10 +1,11 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Optional, Set, Iterable
+from typing import Optional
 
-from .types import Color, Point
-from .board import Board
+from .types import Color, Point, COLOR_CODE, points
+from .board import Board, iter_bits
 from .errors import OutOfBounds, OccupiedPoint, SuicideMove, KoViolation
+from .rules_core import play_raw, NO_KO, ERR_OCCUPIED, ERR_SUICIDE, ERR_KO
 
 
 @dataclass(frozen=True, slots=True)
@@ -22,61 +23,21 @@ class MoveResult:
     captured_points: tuple[Point, ...]
 
 
-def _check_bounds(board: Board, p: Point) -> None:
+def check_bounds(size: int, p: Point) -> None:
     """
-        Validate that a point lies within the board bounds.
+        Validate that a point lies within a ``size`` board.
+        Raises OutOfBounds otherwise.
     """
-    if not (0 <= p.row < board.size and 0 <= p.col < board.size):
+    if not (0 <= p.row < size and 0 <= p.col < size):
         raise OutOfBounds(f"Point out of bounds: {p}")
 
 
-def _group_and_liberties(board: Board, start: Point) -> tuple[Set[Point], Set[Point]]:
-    """
-    Returns (group_points, liberties_points) for the chain at start.
-    Assumes there is a stone at start.
-    """
-    color = board.get(start)
-    assert color is not None
-
-    group: Set[Point] = set()
-    liberties: Set[Point] = set()
-    stack = [start]
-
-    while stack:
-        p = stack.pop()
-        if p in group:
-            continue
-        group.add(p)
-        for nb in board.iter_neighbors(p):
-            s = board.get(nb)
-            if s is None:
-                liberties.add(nb)
-            elif s == color and nb not in group:
-                stack.append(nb)
-
-    return group, liberties
-
-
-def _capturable_enemy_groups(board: Board, placed_at: Point, color: Color) -> Set[Point]:
-    """
-    After placing `color` at `placed_at`, find all enemy stones that have no liberties.
-    Returns all points to remove.
-    """
-    to_capture: Set[Point] = set()
-    for nb in board.iter_neighbors(placed_at):
-        if board.get(nb) == color.opponent:
-            grp, libs = _group_and_liberties(board, nb)
-            if len(libs) == 0:
-                to_capture |= grp
-    return to_capture
-
-
 def apply_move(
     board: Board,
     p: Point,
     color: Color,
     *,
-    ko_forbidden_signature: Optional[tuple] = None,
+    ko_forbidden_signature: Optional[int] = None,
 ) -> MoveResult:
     """
     Applies a move with legality checks:
@@ -88,25 +49,26 @@ def apply_move(
 
     ko_forbidden_signature should be the *board signature* that is illegal to recreate
     (typically the position from 2 plies earlier in simple ko situations).
+
+    The work is done by rules_core.play_raw; this wrapper maps its status
+    codes to GoError subclasses.
     """
-    _check_bounds(board, p)
-    if board.get(p) is not None:
+    check_bounds(board.size, p)
+    status, grid, captured, h = play_raw(
+        board.grid, board.size, board.index(p), COLOR_CODE[color], board.zobrist,
+        NO_KO if ko_forbidden_signature is None else ko_forbidden_signature,
+    )
+    if status == ERR_OCCUPIED:
         raise OccupiedPoint(f"Point already occupied: {p}")
-
-    b1 = board.place(p, color)
-
-    captured_points = _capturable_enemy_groups(b1, p, color)
-    b2 = b1.remove_many(captured_points) if captured_points else b1
-
-    grp, libs = _group_and_liberties(b2, p)
-    if len(libs) == 0:
+    if status == ERR_SUICIDE:
         raise SuicideMove(f"Suicide move at {p} for {color}")
-
-    if ko_forbidden_signature is not None and b2.signature() == ko_forbidden_signature:
+    if status == ERR_KO:
         raise KoViolation("Ko rule violation: recreates forbidden position")
 
+    pts = points(board.size)
+    captured_points = tuple(pts[i] for i in iter_bits(captured))
     return MoveResult(
-        board=b2,
+        board=Board(board.size, grid, h),
         captured=len(captured_points),
-        captured_points=tuple(sorted(captured_points, key=lambda x: (x.row, x.col))),
+        captured_points=captured_points,
     )
@@ -0,0 +1,256 @@
+"""
+Low-level rules kernel.
+
+Works only on flat ``bytes`` grids of cell codes, int bitsets and plain
+int arguments -- no Board, Point or Color objects -- and reports illegal
+moves through integer status codes. rules.apply_move and
+scoring.evaluate_territory are thin wrappers that translate to and from
+the public types, which keeps this module the single place to optimize
+(or replace with a compiled extension).
+"""
+from __future__ import annotations
+
+from .types import EMPTY, BLACK, WHITE, OPPONENT_CODE, neighbor_table
+from .board import ZOBRIST, set_cell, grid_mask, neighbor_bits, edge_masks, iter_bits
+
+OK = 0
+ERR_OCCUPIED = 1
+ERR_SUICIDE = 2
+ERR_KO = 3
+
+NO_KO = -1
+
+
+def flood(seed: int, own: int, size: int) -> int:
+    """
+    Grow the bitset `seed` through the stones in `own` until it covers
+    the whole chain.
+    """
+    group = frontier = seed
+    while frontier:
+        frontier = neighbor_bits(frontier, size) & own & ~group
+        group |= frontier
+    return group
+
+
+def capturable(grid: bytes, size: int, idx: int, code: int) -> int:
+    """
+    Bitset of the enemy stones that placing `code` at the empty index `idx`
+    would leave without liberties. `grid` is the position before the move.
+    """
+    enemy_code = OPPONENT_CODE[code]
+    enemy = empty = 0
+    to_capture = 0
+    for nb in neighbor_table(size)[idx]:
+        if grid[nb] == enemy_code and not (to_capture >> nb) & 1:
+            if not enemy:
+                enemy = grid_mask(grid, enemy_code)
+                empty = grid_mask(grid, EMPTY) & ~(1 << idx)
+            grp = flood(1 << nb, enemy, size)
+            if not neighbor_bits(grp, size) & empty:
+                to_capture |= grp
+    return to_capture
+
+
+def move_hash(zobrist: int, idx: int, code: int, captured: int) -> int:
+    """Zobrist hash after placing `code` at `idx` and removing the `captured` enemy stones."""
+    keys = ZOBRIST
+    enemy_code = OPPONENT_CODE[code]
+    h = zobrist ^ keys[idx][code]
+    for i in iter_bits(captured):
+        h ^= keys[i][enemy_code]
+    return h
+
+
+def write_move(ba: bytearray, idx: int, code: int, captured: int) -> None:
+    """Write stone `code` at `idx` and clear the `captured` bitset, in place."""
+    ba[idx] = code
+    for i in iter_bits(captured):
+        ba[i] = EMPTY
+
+
+def unwrite_move(ba: bytearray, idx: int, code: int, captured: int) -> None:
+    """Revert write_move: clear `idx` and restore the captured enemy stones, in place."""
+    enemy_code = OPPONENT_CODE[code]
+    ba[idx] = EMPTY
+    for i in iter_bits(captured):
+        ba[i] = enemy_code
+
+
+def check_move(
+    grid: bytes | bytearray, size: int, idx: int, code: int, zobrist: int, ko_hash: int = NO_KO,
+) -> tuple[int, int, int]:
+    """
+    Decide whether stone `code` may be played at flat index `idx`, without
+    writing anything.
+
+    A capture always frees a liberty next to the new stone, so suicide is
+    only possible when nothing is captured and no neighbour is empty, and
+    the simple ko can only be recreated by a capture.
+
+    Returns (status, captured_bits, new_zobrist). When status is not OK the
+    other values are 0 and the unchanged hash.
+    """
+    if grid[idx] != EMPTY:
+        return ERR_OCCUPIED, 0, zobrist
+
+    captured = capturable(grid, size, idx, code)
+    if not captured:
+        if not any(grid[nb] == EMPTY for nb in neighbor_table(size)[idx]):
+            placed = 1 << idx
+            group = flood(placed, grid_mask(grid, code) | placed, size)
+            if not neighbor_bits(group, size) & grid_mask(grid, EMPTY):
+                return ERR_SUICIDE, 0, zobrist
+        return OK, 0, zobrist ^ ZOBRIST[idx][code]
+
+    h = move_hash(zobrist, idx, code, captured)
+    if ko_hash != NO_KO and h == ko_hash:
+        return ERR_KO, 0, zobrist
+    return OK, captured, h
+
+
+# Source of check_move with the board size folded in: the size and the
+# edge masks become literals and neighbor_bits is inlined as {NB_x}, so
+# every flood step is a handful of big-int ops with no calls or lookups.
+_CHECK_MOVE_TEMPLATE = """
+def check_move(grid, size, idx, code, zobrist, ko_hash=NO_KO):
+    if grid[idx] != EMPTY:
+        return ERR_OCCUPIED, 0, zobrist
+    nbrs = NEIGHBORS[idx]
+    enemy_code = OPPONENT_CODE[code]
+    enemy = empty = captured = 0
+    for nb in nbrs:
+        if grid[nb] == enemy_code and not (captured >> nb) & 1:
+            if not enemy:
+                enemy = grid_mask(grid, enemy_code)
+                empty = grid_mask(grid, EMPTY) & ~(1 << idx)
+            grp = frontier = 1 << nb
+            while frontier:
+                frontier = {NB_frontier} & enemy & ~grp
+                grp |= frontier
+            if not {NB_grp} & empty:
+                captured |= grp
+    if not captured:
+        for nb in nbrs:
+            if grid[nb] == EMPTY:
+                break
+        else:
+            placed = 1 << idx
+            own = grid_mask(grid, code) | placed
+            grp = frontier = placed
+            while frontier:
+                frontier = {NB_frontier} & own & ~grp
+                grp |= frontier
+            if not {NB_grp} & grid_mask(grid, EMPTY) & ~placed:
+                return ERR_SUICIDE, 0, zobrist
+        return OK, 0, zobrist ^ ZOBRIST[idx][code]
+    h = move_hash(zobrist, idx, code, captured)
+    if ko_hash != NO_KO and h == ko_hash:
+        return ERR_KO, 0, zobrist
+    return OK, captured, h
+"""
+
+
+def _specialize_check_move(size: int):
+    """
+    Build a check_move equivalent for one board size from _CHECK_MOVE_TEMPLATE.
+    The `size` argument of the generated function is kept for call
+    compatibility and ignored.
+    """
+    full, not_first, not_last = edge_masks(size)
+
+    def nb(x: str) -> str:
+        return (f"((({x} << 1) & {not_first:#x}) | (({x} >> 1) & {not_last:#x})"
+                f" | (({x} << {size}) & {full:#x}) | ({x} >> {size}))")
+
+    src = _CHECK_MOVE_TEMPLATE.format(NB_frontier=nb("frontier"), NB_grp=nb("grp"))
+    namespace = {
+        "NEIGHBORS": neighbor_table(size), "OPPONENT_CODE": OPPONENT_CODE,
+        "ZOBRIST": ZOBRIST, "grid_mask": grid_mask, "move_hash": move_hash,
+        "EMPTY": EMPTY, "OK": OK, "ERR_OCCUPIED": ERR_OCCUPIED,
+        "ERR_SUICIDE": ERR_SUICIDE, "ERR_KO": ERR_KO, "NO_KO": NO_KO,
+    }
+    exec(compile(src, f"<rules_core.check_move_{size}>", "exec"), namespace)
+    return namespace["check_move"]
+
+
+# Size-specialized check_move kernels for the standard boards; other sizes
+# use the generic check_move. Look up through kernel_for().
+RULES_KERNELS = {size: _specialize_check_move(size) for size in (9, 13, 19)}
+
+
+def kernel_for(size: int):
+    """Return the check_move implementation to use for a ``size`` board."""
+    return RULES_KERNELS.get(size, check_move)
+
+
+def play_raw(
+    grid: bytes, size: int, idx: int, code: int, zobrist: int, ko_hash: int = NO_KO,
+) -> tuple[int, bytes, int, int]:
+    """
+    Play stone `code` at flat index `idx` on an immutable grid.
+
+    Legality is decided by check_move before anything is written, so only
+    a legal move allocates the new grid: a quiet move splices the one
+    changed cell, a capture is written through one scratch buffer.
+
+    Returns (status, new_grid, captured_bits, new_zobrist). When status is
+    not OK the other values are those of the unchanged input position.
+    """
+    status, captured, h = kernel_for(size)(grid, size, idx, code, zobrist, ko_hash)
+    if status != OK:
+        return status, grid, 0, zobrist
+    if not captured:
+        return OK, set_cell(grid, idx, code), 0, h
+    ba = bytearray(grid)
+    write_move(ba, idx, code, captured)
+    return OK, bytes(ba), captured, h
+
+
+def play_inplace(
+    ba: bytearray, size: int, idx: int, code: int, zobrist: int, ko_hash: int = NO_KO,
+) -> tuple[int, int, int]:
+    """
+    Play stone `code` at flat index `idx`, mutating `ba` only if the move is legal.
+    Returns (status, captured_bits, new_zobrist) as check_move does.
+    """
+    status, captured, h = kernel_for(size)(ba, size, idx, code, zobrist, ko_hash)
+    if status == OK:
+        write_move(ba, idx, code, captured)
+    return status, captured, h
+
+
+def territory_raw(grid: bytes, size: int) -> tuple[int, int, int]:
+    """
+    Flood-fill empty regions and assign each to BLACK/WHITE when it borders
+    only that color. Returns (territory_black, territory_white, neutral).
+
+    Regions are grown as bitsets through the empty mask, and the bordering
+    colors are collected from each flood step's dilation in the same pass
+    (bit 0 = black seen, bit 1 = white seen); once both are seen the region
+    is neutral and the remaining steps skip the color tests.
+    """
+    empty = grid_mask(grid, EMPTY)
+    black = grid_mask(grid, BLACK)
+    white = grid_mask(grid, WHITE)
+
+    counts = [0, 0, 0]  # indexed by owner code: neutral, black, white
+
+    remaining = empty
+    while remaining:
+        region = frontier = remaining & -remaining
+        borders = 0
+        while frontier:
+            dilated = neighbor_bits(frontier, size)
+            if borders != 3:
+                if dilated & black:
+                    borders |= 1
+                if dilated & white:
+                    borders |= 2
+            frontier = dilated & empty & ~region
+            region |= frontier
+        remaining &= ~region
+        # borders 1/2 map straight to the BLACK/WHITE codes; 0 and 3 are neutral.
+        counts[borders if borders != 3 else EMPTY] += region.bit_count()
+
+    return counts[BLACK], counts[WHITE], counts[EMPTY]
@@ -4,7 +4,9 @@ import json
 from pathlib import Path
 from typing import Any, Optional, Tuple
 
-from go_game.engine.game_state import GameState, MoveRecord
+from go_game.engine.board import Board
+from go_game.engine.game_state import GameState, HistoryNode, MoveRecord
+from go_game.engine.mutable_state import MutableGameState
 from go_game.engine.types import Color, Point
 
 
@@ -20,6 +22,20 @@ def _obj_to_point(obj: Optional[dict[str, int]]) -> Optional[Point]:
     return Point(row=int(obj["row"]), col=int(obj["col"]))
 
 
+_CELL_CHARS = ".BW"
+_CHAR_CODES = {ch: code for code, ch in enumerate(_CELL_CHARS)}
+
+
+def _board_to_rows(board: Board) -> list[str]:
+    n = board.size
+    chars = "".join(_CELL_CHARS[c] for c in board.grid)
+    return [chars[r * n:(r + 1) * n] for r in range(n)]
+
+
+def _rows_to_board(size: int, rows: list[str]) -> Board:
+    return Board.from_grid(size, bytes(_CHAR_CODES[ch] for ch in "".join(rows)))
+
+
 def game_to_dict(
     state: GameState,
     *,
@@ -28,7 +44,7 @@ def game_to_dict(
     board_size: int,
 ) -> dict[str, Any]:
     return {
-        "version": 1,
+        "version": 2,
         "board_size": board_size,
         "ai_enabled": ai_enabled,
         "ai_color": ai_color.value,
@@ -38,30 +54,72 @@ def game_to_dict(
                 "point": _point_to_obj(m.point),
                 "captured": m.captured,
             }
-            for m in state.history
+            for m in state.iter_history()
         ],
+        "position": {
+            "board": _board_to_rows(state.board),
+            "next_player": state.next_player.value,
+            "captures_black": state.captures_black,
+            "captures_white": state.captures_white,
+            "ko_hash": state.ko_forbidden_signature,
+            "last_move": _point_to_obj(state.last_move),
+            "consecutive_passes": state.consecutive_passes,
+            "is_over": state.is_over,
+        },
     }
 
 
-def dict_to_game(data: dict[str, Any]) -> Tuple[GameState, bool, Color, int]:
-    size = int(data.get("board_size", 9))
-    ai_enabled = bool(data.get("ai_enabled", True))
-    ai_color = Color(data.get("ai_color", "W"))
+def _history_from_dicts(hist: list[dict[str, Any]]) -> tuple[Optional[HistoryNode], int, int]:
+    node: Optional[HistoryNode] = None
+    passes = 0
+    for m in hist:
+        point = _obj_to_point(m.get("point"))
+        passes += point is None
+        node = HistoryNode(MoveRecord(Color(m["color"]), point, int(m.get("captured", 0))), node)
+    return node, len(hist), passes
 
-    state = GameState.new(size=size)
 
-    hist = data.get("history", [])
+def _replay_history(size: int, hist: list[dict[str, Any]]) -> GameState:
+    """Rebuild a version 1 session by replaying its moves on a mutable board."""
+    state = MutableGameState.new(size=size)
     for m in hist:
         color = Color(m["color"])
         point = _obj_to_point(m.get("point"))
         if state.next_player != color:
-            state = state.pass_turn()
+            state.pass_turn()
 
         if point is None:
-            state = state.pass_turn()
+            state.pass_turn()
         else:
-            state = state.play(point)
+            state.play(point)
+    return state.to_state()
+
+
+def dict_to_game(data: dict[str, Any]) -> Tuple[GameState, bool, Color, int]:
+    size = int(data.get("board_size", 9))
+    ai_enabled = bool(data.get("ai_enabled", True))
+    ai_color = Color(data.get("ai_color", "W"))
 
+    hist = data.get("history", [])
+    pos = data.get("position")
+    if pos is None:
+        return _replay_history(size, hist), ai_enabled, ai_color, size
+
+    history, moves, passes = _history_from_dicts(hist)
+    ko = pos.get("ko_hash")
+    state = GameState(
+        board=_rows_to_board(size, pos["board"]),
+        next_player=Color(pos["next_player"]),
+        captures_black=int(pos["captures_black"]),
+        captures_white=int(pos["captures_white"]),
+        ko_forbidden_signature=None if ko is None else int(ko),
+        last_move=_obj_to_point(pos.get("last_move")),
+        consecutive_passes=int(pos.get("consecutive_passes", 0)),
+        is_over=bool(pos.get("is_over", False)),
+        history=history,
+        moves_total=moves,
+        passes_total=passes,
+    )
     return state, ai_enabled, ai_color, size
 
 
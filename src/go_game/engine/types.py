@@ -1,7 +1,7 @@
 from __future__ import annotations
-from dataclasses import dataclass
 from enum import Enum
-from typing import Iterable
+from functools import lru_cache
+from typing import Iterable, NamedTuple
 
 class Color(str, Enum):
     BLACK = "B"
@@ -11,14 +11,53 @@ class Color(str, Enum):
     def opponent(self) -> "Color":
         return Color.WHITE if self is Color.BLACK else Color.BLACK
 
-@dataclass(frozen=True, slots=True)
-class Point:
+# Integer cell codes used by the board grid and the rules kernel. Colors are
+# translated once at the public API boundary so the hot paths only compare ints.
+EMPTY = 0
+BLACK = 1
+WHITE = 2
+
+COLOR_CODE: dict[Color, int] = {Color.BLACK: BLACK, Color.WHITE: WHITE}
+
+# Opponent cell code, indexed by cell code (EMPTY maps to itself).
+OPPONENT_CODE: tuple[int, int, int] = (EMPTY, WHITE, BLACK)
+
+class Point(NamedTuple):
+    """
+    Board intersection. A NamedTuple rather than a dataclass: construction,
+    hashing and equality run in C, which matters for the set and dict
+    lookups on move lists. Hot paths use flat indices and points() instead.
+    """
     row: int
     col: int
 
+@lru_cache(maxsize=None)
+def points(size: int) -> tuple[Point, ...]:
+    """Canonical Point instances of a board, indexed by flat index row * size + col."""
+    return tuple(Point(r, c) for r in range(size) for c in range(size))
+
+@lru_cache(maxsize=None)
+def neighbor_table(size: int) -> tuple[tuple[int, ...], ...]:
+    """
+    Return, for every flat index of a ``size`` board, the tuple of its
+    orthogonally adjacent flat indices (2 to 4 entries).
+    """
+    table = []
+    for idx in range(size * size):
+        r, c = divmod(idx, size)
+        nbs = []
+        if r > 0: nbs.append(idx - size)
+        if r < size - 1: nbs.append(idx + size)
+        if c > 0: nbs.append(idx - 1)
+        if c < size - 1: nbs.append(idx + 1)
+        table.append(tuple(nbs))
+    return tuple(table)
+
+@lru_cache(maxsize=None)
+def _neighbor_points(size: int) -> tuple[tuple[Point, ...], ...]:
+    """neighbor_table() with the canonical Point of each neighbouring index."""
+    pts = points(size)
+    return tuple(tuple(pts[j] for j in nbrs) for nbrs in neighbor_table(size))
+
 def iter_neighbors(p: Point, size: int) -> Iterable[Point]:
-    r, c = p.row, p.col
-    if r > 0: yield Point(r - 1, c)
-    if r < size - 1: yield Point(r + 1, c)
-    if c > 0: yield Point(r, c - 1)
-    if c < size - 1: yield Point(r, c + 1)
+    return _neighbor_points(size)[p.row * size + p.col]
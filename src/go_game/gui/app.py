@@ -2,11 +2,15 @@ from __future__ import annotations
 
 import tkinter as tk
 from tkinter import filedialog, messagebox
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
-from go_game.engine.game_state import GameState
-from go_game.engine.types import Point, Color
+from go_game.engine.game_state import GameState, MoveDelta
+from go_game.engine.types import Point, Color, EMPTY, BLACK, WHITE, COLOR_CODE, points
+from go_game.engine.board import Board, iter_bits, edge_masks, changed_indices
 from go_game.engine.errors import GoError
 
 from go_game.engine.ai import RandomAI
@@ -21,6 +25,62 @@ class RenderConfig:
     hint_radius: int = 5
 
 
+# Canvas fill color indexed by board cell code (0 = empty is never shown).
+FILL = (None, "black", "white")
+
+# Stone item tags indexed by cell code. Shown stones also carry a per-color
+# tag (stone_B / stone_W), so one tagged call restyles every stone of a color.
+STONE_TAGS = ("stone", "stone stone_B", "stone stone_W")
+
+
+def _stone_image(master, radius: int, fill: str, outline: str = "black", width: int = 2) -> tk.PhotoImage:
+    """
+       Render a stone of the given radius into a new PhotoImage.
+
+       A new PhotoImage is fully transparent, so only the disc is written,
+       one put() per pixel row; pixels within `width` of the rim get the
+       outline color.
+    """
+    size = 2 * radius
+    img = tk.PhotoImage(master=master, width=size, height=size)
+    outer, inner = radius * radius, (radius - width) ** 2
+    for y in range(size):
+        dy = y + 0.5 - radius
+        row = []
+        start = 0
+        for x in range(size):
+            dx = x + 0.5 - radius
+            d = dx * dx + dy * dy
+            if d <= outer:
+                if not row:
+                    start = x
+                row.append(fill if d < inner else outline)
+        if row:
+            img.put("{" + " ".join(row) + "}", to=(start, y))
+    return img
+
+
+# Every n-th undo entry also keeps the full state it reverts to.
+UNDO_CHECKPOINT_EVERY = 32
+
+# Number of moves that can be undone (and redone); older entries are dropped.
+UNDO_DEPTH = 256
+
+
+@dataclass(frozen=True, slots=True)
+class UndoEntry:
+    """
+       One step of the undo history.
+
+       Attributes:
+           delta: The move to take back.
+           checkpoint: The state before the move, kept when that state's
+               move count is a multiple of UNDO_CHECKPOINT_EVERY; None otherwise.
+    """
+    delta: MoveDelta
+    checkpoint: GameState | None = None
+
+
 class GoApp:
     """
        Main GUI application for the Go game.
@@ -34,16 +94,31 @@ class GoApp:
 
         self.session_dir = Path.cwd() / "sessions"
         self.autosave_path = self.session_dir / "last_session.json"
+        # Autosaves are batched: actions only mark the session dirty and the
+        # file is written at most every 500 ms, off the Tk thread.
+        self._io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="go-io")
+        self._dirty = False
+        self._autosave_pending = False
+        self._last_saved_key: tuple | None = None
 
         self.size = size
-        self.state = GameState.new(size=self.size)
+        # Empty-board start state per board size. States are immutable, so
+        # every new game of a size reuses one, along with its memoized
+        # chain table and legal moves.
+        self._fresh_states: dict[int, GameState] = {}
+        self.state = self._fresh_state(self.size)
 
         self.ai_enabled = True
         self.ai_color = Color.WHITE
         self.ai_busy = False
+        # AI moves are computed off the Tk thread; results from an older
+        # epoch (the game was replaced meanwhile) are discarded.
+        self._ai_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="go-ai")
+        self._ai_epoch = 0
+        self._dialog_open = False
 
-        self.undo_stack: list[GameState] = []
-        self.redo_stack: list[GameState] = []
+        self.undo_stack: deque[UndoEntry] = deque(maxlen=UNDO_DEPTH)
+        self.redo_stack: deque[MoveDelta] = deque(maxlen=UNDO_DEPTH)
 
         self.controls = tk.Frame(root)
         self.controls.pack(fill="x", padx=8, pady=6)
@@ -63,6 +138,9 @@ class GoApp:
         self.ai_btn = tk.Button(self.controls, text="AI: ON", command=self.toggle_ai)
         self.ai_btn.pack(side="left", padx=(8, 0))
 
+        self.hints_btn = tk.Button(self.controls, text="Hints: ON", command=self.toggle_hints)
+        self.hints_btn.pack(side="left", padx=(8, 0))
+
         tk.Label(self.controls, text="Size:").pack(side="left", padx=(12, 4))
         self.size_var = tk.StringVar(value=str(self.size))
         self.size_menu = tk.OptionMenu(self.controls, self.size_var, "9", "13", "19")
@@ -79,110 +157,390 @@ class GoApp:
 
         self.canvas = tk.Canvas(root, highlightthickness=0)
         self.canvas.pack()
+        # Hot drawing paths issue canvas commands through tk.call directly,
+        # skipping Tkinter's per-call option flattening.
+        self._tk_call = self.canvas.tk.call
+        self._cw = self.canvas._w
+        # Stones are drawn as two pre-rendered images, indexed by cell code;
+        # the references also keep the images alive.
+        r = self.cfg.stone_radius
+        self._stone_images = (
+            None,
+            _stone_image(self.canvas, r, FILL[BLACK]),
+            _stone_image(self.canvas, r, FILL[WHITE]),
+        )
+        self._stone_image_names = (None, str(self._stone_images[1]), str(self._stone_images[2]))
 
         self.status = tk.Label(root, text="", anchor="w")
         self.status.pack(fill="x", padx=8, pady=6)
 
         self.canvas.bind("<Button-1>", self.on_click)
-
-        self._resize_canvas_for_board()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        # Canvas items are long-lived and updated in place; see
+        # build_static_scene() and refresh_dynamic().
+        self._stone_pool: list[int] = []  # flat index -> oval item id
+        self._drawn_board = None
+        self._hint_pool: list[int] = []
+        self._hints_shown: set[int] = set()
+        self._last_status_text: str | None = None
+        self._status_key: tuple | None = None
+        # Legal-move hints default to on for small boards only; the toggle
+        # holds until the board size changes.
+        self.show_hints = True
+
+        self._redraw_pending = False
+        self._batch_depth = 0
+        self._redraw_deferred = False
+        self._ctrl_sig: tuple | None = None
+        self._ctrl_state: dict[str, str] = {}
+
+        self.build_static_scene()
+        self.change_size(self.size)
         self.redraw()
 
-        self.maybe_ai_turn()
+        # Let the window paint before a first AI move is started.
+        self.root.after_idle(self.maybe_ai_turn)
 
-    def _resize_canvas_for_board(self):
-        w = self.cfg.margin * 2 + self.cfg.cell * (self.size - 1)
-        h = self.cfg.margin * 2 + self.cfg.cell * (self.size - 1)
+    def change_size(self, new_size: int):
+        """
+            Lay the board out for `new_size` on the existing canvas: the
+            canvas is resized, the coordinate tables rebuilt and the pooled
+            items moved into place and hidden (see _layout_scene()). No
+            widget or canvas item is destroyed.
+        """
+        self.size = new_size
+        w = self.cfg.margin * 2 + self.cfg.cell * (new_size - 1)
+        h = self.cfg.margin * 2 + self.cfg.cell * (new_size - 1)
         self.canvas.config(width=w, height=h)
 
+        self._build_coord_tables(new_size)
+        self._layout_scene()
+        self.show_hints = new_size < 13
+        self.hints_btn.config(text=f"Hints: {'ON' if self.show_hints else 'OFF'}")
+
+    def _fresh_state(self, size: int) -> GameState:
+        """Return the shared start state for a `size` board."""
+        state = self._fresh_states.get(size)
+        if state is None:
+            state = self._fresh_states[size] = GameState.new(size=size)
+        return state
+
+    def _build_coord_tables(self, size: int):
+        """
+            Precompute the pixel position of every column and row line, and
+            from them, per flat index, the stone image centers and the oval
+            bounding boxes of the hints and the last-move marker.
+        """
+        m, cell = self.cfg.margin, self.cfg.cell
+        self._col_x = [m + c * cell for c in range(size)]
+        self._row_y = [m + r * cell for r in range(size)]
+        # Clicks count within this many pixels of an intersection, per axis.
+        self._hit_threshold = int(cell * 0.35)
+        self._centers = [(x, y) for y in self._row_y for x in self._col_x]
+        self._hint_bbox = self._bbox_table(self.cfg.hint_radius)
+        self._last_bbox = self._bbox_table(self.cfg.stone_radius + 6)
+
+    def _bbox_table(self, r: int) -> list[tuple[int, int, int, int]]:
+        return [(x - r, y - r, x + r, y + r) for y in self._row_y for x in self._col_x]
+
+    def build_static_scene(self):
+        """
+            Create the long-lived canvas items: the two grid polylines and
+            the hidden last-move marker. The hint oval and stone image
+            pools are added by _layout_scene() as board sizes need them.
+            Nothing is laid out here; refresh_dynamic() only toggles these
+            items.
+        """
+        self.canvas.delete("all")
+        call, cw = self._tk_call, self._cw
+        self._grid_lines = tuple(
+            call(cw, "create", "line", 0, 0, 0, 0, "-tags", "grid") for _ in range(2)
+        )
+        self._hint_pool = []
+        self._stone_pool = []
+        call(
+            cw, "create", "oval", 0, 0, 0, 0, "-outline", "red", "-width", 2,
+            "-state", "hidden", "-tags", "last_move",
+        )
+
+    def _layout_scene(self):
+        """
+            Move the pooled items onto the current board and hide them all.
+            Both pools hold one item (hint oval, stone image) per flat index
+            of the largest board seen so far and grow when a bigger one
+            comes along; items past the current board stay hidden. Stacking
+            order, bottom to top: grid, hints, stones, last-move marker.
+        """
+        call, cw = self._tk_call, self._cw
+        cells = self.size * self.size
+        hints, stones = self._hint_pool, self._stone_pool
+        if len(stones) < cells:
+            for _ in range(cells - len(stones)):
+                hints.append(call(cw, "create", "oval", 0, 0, 0, 0,
+                                  "-outline", "gray25", "-state", "hidden", "-tags", "hint"))
+                stones.append(call(cw, "create", "image", 0, 0, "-state", "hidden", "-tags", "stone"))
+            call(cw, "raise", "stone")
+            call(cw, "raise", "last_move")
+
+        self.draw_grid()
+        for item, bbox in zip(hints, self._hint_bbox):
+            call(cw, "coords", item, *bbox)
+        for item, (x, y) in zip(stones, self._centers):
+            call(cw, "coords", item, x, y)
+        call(cw, "itemconfigure", "hint", "-state", "hidden")
+        call(cw, "itemconfigure", "stone", "-state", "hidden", "-tags", STONE_TAGS[EMPTY])
+        call(cw, "itemconfigure", "last_move", "-state", "hidden")
+        self._hints_shown = set()
+        self._drawn_board = None
+
     # ---------- coordinate mapping ----------
     def p_to_xy(self, p: Point) -> tuple[int, int]:
-        x = self.cfg.margin + p.col * self.cfg.cell
-        y = self.cfg.margin + p.row * self.cfg.cell
-        return x, y
+        return self._col_x[p.col], self._row_y[p.row]
 
     def xy_to_point(self, x: int, y: int) -> Point | None:
-        col = round((x - self.cfg.margin) / self.cfg.cell)
-        row = round((y - self.cfg.margin) / self.cfg.cell)
-        if 0 <= row < self.size and 0 <= col < self.size:
-            ix, iy = self.p_to_xy(Point(row, col))
-            if abs(ix - x) <= self.cfg.cell * 0.35 and abs(iy - y) <= self.cfg.cell * 0.35:
-                return Point(row, col)
+        """
+            Map a pixel to the intersection it hits, or None. Integer-only:
+            the nearest line is found by floor division and the hit must lie
+            within _hit_threshold pixels of it on both axes.
+        """
+        m, cell, size = self.cfg.margin, self.cfg.cell, self.size
+        half = cell // 2
+        col = (x - m + half) // cell
+        row = (y - m + half) // cell
+        if not (0 <= row < size and 0 <= col < size):
+            return None
+        t = self._hit_threshold
+        if -t <= x - self._col_x[col] <= t and -t <= y - self._row_y[row] <= t:
+            return points(size)[row * size + col]
         return None
 
-    def push_undo(self):
-        self.undo_stack.append(self.state)
+    def push_undo(self, new_state: GameState):
+        """
+            Make `new_state` (the result of a move from the current state)
+            current, recording the move for undo and dropping the redo history.
+        """
+        self._record_undo(self.state, new_state)
         self.redo_stack.clear()
+        self.state = new_state
 
-    def autosave(self):
+    def _record_undo(self, before: GameState, after: GameState):
+        checkpoint = before if before.moves_total % UNDO_CHECKPOINT_EVERY == 0 else None
+        self.undo_stack.append(UndoEntry(MoveDelta.between(before, after), checkpoint))
+
+    def _autosave_key(self) -> tuple:
+        """
+            Identify what the autosave file would contain. The position hash
+            rules out most changes in O(1); the history node (compared by
+            identity) pins down the exact move sequence.
+        """
+        state = self.state
+        return state.zobrist, state.history, self.ai_enabled, self.ai_color, self.size
+
+    def _mark_dirty(self):
+        """Note that the session changed; the autosave is written shortly after."""
+        self._dirty = True
+        if not self._autosave_pending:
+            self._autosave_pending = True
+            self.root.after(500, self._flush_autosave)
+
+    def _flush_autosave(self):
+        self._autosave_pending = False
+        if not self._dirty:
+            return
+        self._dirty = False
+        key = self._autosave_key()
+        if key == self._last_saved_key:
+            return
+        self._last_saved_key = key
+        self._io_executor.submit(self._write_autosave, self.state, self.ai_enabled, self.ai_color, self.size)
+
+    def _write_autosave(self, state: GameState, ai_enabled: bool, ai_color: Color, size: int):
         try:
             save_session(
                 self.autosave_path,
-                self.state,
-                ai_enabled=self.ai_enabled,
-                ai_color=self.ai_color,
-                board_size=self.size,
+                state,
+                ai_enabled=ai_enabled,
+                ai_color=ai_color,
+                board_size=size,
             )
         except Exception:
             pass
 
+    def autosave(self):
+        """Write the autosave file now, on the calling thread, if it is out of date."""
+        self._dirty = False
+        key = self._autosave_key()
+        if key != self._last_saved_key:
+            self._last_saved_key = key
+            self._write_autosave(self.state, self.ai_enabled, self.ai_color, self.size)
+
+    def on_close(self):
+        """Finish pending autosaves, write the final one and close the window."""
+        self._cancel_ai()
+        self._ai_executor.shutdown(wait=False)
+        self._io_executor.shutdown(wait=True)
+        self.autosave()
+        self.root.destroy()
+
+    def _legal(self) -> tuple[Point, ...]:
+        """
+            Legal moves of the current state. GameState memoizes them, so
+            the hints and the AI turn share one computation per state, and
+            undo/redo back to a state reuses it.
+        """
+        return self.state.legal_move_tuple()
+
+    def schedule_redraw(self):
+        """
+            Request a redraw once the event loop is idle.
+            Repeated requests before then collapse into a single redraw;
+            inside batch_updates() the request is held until the batch ends.
+        """
+        if self._batch_depth:
+            self._redraw_deferred = True
+        elif not self._redraw_pending:
+            self._redraw_pending = True
+            self.root.after_idle(self._do_redraw)
+
+    @contextmanager
+    def batch_updates(self):
+        """
+            Group several state changes into one redraw. Redraw requests made
+            inside the block (nested blocks included) are merged and
+            scheduled once, when the outermost block exits.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._redraw_deferred:
+                self._redraw_deferred = False
+                self.schedule_redraw()
+
+    def _do_redraw(self):
+        self._redraw_pending = False
+        self.redraw()
+
     def redraw(self):
-        self.canvas.delete("all")
-        self.draw_grid()
-        self.draw_hints()
-        self.draw_stones()
-        self.draw_last_move_marker()
+        """Bring the canvas in line with the current state."""
+        self.refresh_dynamic()
+
+    def refresh_dynamic(self):
+        """
+            Update the pooled items built by build_static_scene(): hints
+            and stones are diffed against what is shown, the marker is
+            moved, and the status bar and controls are only touched when
+            their content changes. The state and its flags are read once
+            and handed to the helpers.
+        """
+        state = self.state
+        over = state.is_over
+        self.draw_hints(state, over)
+        self.draw_stones(state.board)
+        self.draw_last_move_marker(None if over else state.last_move)
         self.update_status()
         self.update_controls()
 
     def draw_grid(self):
-        m, cell = self.cfg.margin, self.cfg.cell
-        start = m
-        end = m + cell * (self.size - 1)
-
-        for i in range(self.size):
-            x = m + i * cell
-            y = m + i * cell
-            self.canvas.create_line(start, y, end, y)
-            self.canvas.create_line(x, start, x, end)
+        """
+            Lay the grid out as two polylines, one for the rows and one for
+            the columns. Each zig-zags across the board and steps to the
+            next line along the border, which is itself a grid line, so the
+            result looks like 2 * size separate lines.
+        """
+        xs, ys = self._col_x, self._row_y
+        left, right = xs[0], xs[-1]
+        top, bottom = ys[0], ys[-1]
+
+        rows: list[int] = []
+        cols: list[int] = []
+        for i, y in enumerate(ys):
+            a, b = (left, right) if i % 2 == 0 else (right, left)
+            rows += (a, y, b, y)
+        for i, x in enumerate(xs):
+            a, b = (top, bottom) if i % 2 == 0 else (bottom, top)
+            cols += (x, a, x, b)
+        call, cw = self._tk_call, self._cw
+        call(cw, "coords", self._grid_lines[0], *rows)
+        call(cw, "coords", self._grid_lines[1], *cols)
+
+    def draw_stones(self, board: Board):
+        """
+            Show, hide or swap the pooled stone images of the points that
+            changed between the last drawn board and `board`. After
+            _layout_scene() every image is hidden, so the whole board counts
+            as changed from an empty one.
+        """
+        grid = board.grid
+        prev = self._drawn_board
+        pool = self._stone_pool
+        images = self._stone_image_names
+        call, cw = self._tk_call, self._cw
+
+        if prev is None:
+            changed = iter_bits(board.mask(EMPTY) ^ edge_masks(board.size)[0])
+        else:
+            changed = changed_indices(prev.grid, grid)
+        for i in changed:
+            code = grid[i]
+            if code == EMPTY:
+                call(cw, "itemconfigure", pool[i], "-state", "hidden", "-tags", STONE_TAGS[EMPTY])
+            else:
+                call(cw, "itemconfigure", pool[i], "-state", "normal", "-image", images[code],
+                     "-tags", STONE_TAGS[code])
+        self._drawn_board = board
 
-    def draw_stones(self):
-        r = self.cfg.stone_radius
-        for row in range(self.size):
-            for col in range(self.size):
-                p = Point(row, col)
-                stone = self.state.board.get(p)
-                if stone is None:
-                    continue
-                x, y = self.p_to_xy(p)
-                fill = "black" if stone is Color.BLACK else "white"
-                self.canvas.create_oval(x - r, y - r, x + r, y + r, fill=fill, outline="black", width=2)
-
-    def draw_hints(self):
-        if self.state.is_over:
-            return
-        r = self.cfg.hint_radius
-        fill = "black" if self.state.next_player is Color.BLACK else "white"
-        for p in self.state.legal_moves():
-            x, y = self.p_to_xy(p)
-            self.canvas.create_oval(x - r, y - r, x + r, y + r, fill=fill, outline="gray25")
-
-    def draw_last_move_marker(self):
-        if self.state.last_move is None or self.state.is_over:
+    def draw_hints(self, state: GameState, over: bool):
+        """
+            Show the pooled hint ovals of the legal moves in `state` and hide
+            the rest. Only the ovals whose visibility changed are touched,
+            plus one tag-wide fill update for the player to move. Hints are
+            hidden while switched off, once the game is over and during AI
+            turns.
+        """
+        call, w = self._tk_call, self._cw
+        pool, shown = self._hint_pool, self._hints_shown
+        if not self.show_hints or self.ai_busy or over:
+            wanted: set[int] = set()
+        else:
+            wanted = set(state.legal_move_indices())
+            call(w, "itemconfigure", "hint", "-fill", FILL[COLOR_CODE[state.next_player]])
+        for i in shown - wanted:
+            call(w, "itemconfigure", pool[i], "-state", "hidden")
+        for i in wanted - shown:
+            call(w, "itemconfigure", pool[i], "-state", "normal")
+        self._hints_shown = wanted
+
+    def draw_last_move_marker(self, last_move: Point | None):
+        """Move the marker (tag "last_move") onto `last_move`, or hide it for None."""
+        call, cw = self._tk_call, self._cw
+        if last_move is None:
+            call(cw, "itemconfigure", "last_move", "-state", "hidden")
             return
-        x, y = self.p_to_xy(self.state.last_move)
-        r = self.cfg.stone_radius + 6
-        self.canvas.create_oval(x - r, y - r, x + r, y + r, outline="red", width=2)
+        bbox = self._last_bbox[last_move.row * self.size + last_move.col]
+        call(cw, "coords", "last_move", *bbox)
+        call(cw, "itemconfigure", "last_move", "-state", "normal")
 
     def update_status(self):
         """
             Update the status bar.
             Displays turn information or final score when the game ends.
         """
+        st = self.state
+        # The text depends on nothing else, so an unchanged key skips
+        # building it (and, for a finished game, scoring the board again).
+        key = (st, self.ai_busy, self.ai_enabled, self.ai_color)
+        if key == self._status_key:
+            return
+        self._status_key = key
         ai_txt = f" | AI: {'ON' if self.ai_enabled else 'OFF'} ({self.ai_color.value})"
 
-        if self.state.is_over:
-            sb = self.state.score()
+        if self.ai_busy:
+            text = "AI is thinking..."
+        elif st.is_over:
+            sb = st.score()
             if sb.score_black > sb.score_white:
                 winner = "B"
             elif sb.score_white > sb.score_black:
@@ -190,42 +548,76 @@ class GoApp:
             else:
                 winner = "DRAW"
 
-            self.status.config(
-                text=(
-                    f"GAME OVER | "
-                    f"Territory B:{sb.territory_black} W:{sb.territory_white} | "
-                    f"Captures B:{sb.captures_black} W:{sb.captures_white} | "
-                    f"Score B:{sb.score_black} W:{sb.score_white} | "
-                    f"Winner: {winner}"
-                    f"{ai_txt}"
-                )
+            text = (
+                f"GAME OVER | "
+                f"Territory B:{sb.territory_black} W:{sb.territory_white} | "
+                f"Captures B:{sb.captures_black} W:{sb.captures_white} | "
+                f"Score B:{sb.score_black} W:{sb.score_white} | "
+                f"Winner: {winner}"
+                f"{ai_txt}"
             )
         else:
-            self.status.config(
-                text=f"Turn: {self.state.next_player.value} | "
-                     f"Captures B:{self.state.captures_black} W:{self.state.captures_white} | "
-                     f"Passes: {self.state.consecutive_passes}{ai_txt}"
+            text = (
+                f"Turn: {st.next_player.value} | "
+                f"Captures B:{st.captures_black} W:{st.captures_white} | "
+                f"Passes: {st.consecutive_passes}{ai_txt}"
             )
+        self._set_status(text)
+
+    def _set_status(self, text: str):
+        """Show `text` in the status bar, skipping the widget update if it is already shown."""
+        if text != self._last_status_text:
+            self._last_status_text = text
+            self.status.config(text=text)
+
+    def _flash_status(self, text: str):
+        """Show a short-lived message, then go back to the regular status."""
+        self._set_status(text)
+        self._status_key = None
+        self.root.after(900, self.update_status)
 
     def update_controls(self):
+        """
+            Enable/disable the controls for the current state.
+            Skipped when nothing they depend on changed, and only widgets
+            whose state actually changes are reconfigured.
+        """
         busy = self.ai_busy
-
-        self.pass_btn.config(state=("disabled" if self.state.is_over or busy else "normal"))
-        self.new_btn.config(state=("disabled" if busy else "normal"))
-        self.ai_btn.config(state=("disabled" if busy else "normal"))
-        self.undo_btn.config(state=("normal" if (not busy and len(self.undo_stack) > 0) else "disabled"))
-        self.redo_btn.config(state=("normal" if (not busy and len(self.redo_stack) > 0) else "disabled"))
-        self.apply_size_btn.config(state=("disabled" if busy else "normal"))
-        self.size_menu.config(state=("disabled" if busy else "normal"))
-        self.save_btn.config(state=("disabled" if busy else "normal"))
-        self.load_btn.config(state=("disabled" if busy else "normal"))
+        over = self.state.is_over
+        sig = (busy, over, bool(self.undo_stack), bool(self.redo_stack))
+        if sig == self._ctrl_sig:
+            return
+        self._ctrl_sig = sig
+
+        idle = "disabled" if busy else "normal"
+        wanted = {
+            "pass": (self.pass_btn, "disabled" if over or busy else "normal"),
+            "new": (self.new_btn, idle),
+            "ai": (self.ai_btn, idle),
+            "undo": (self.undo_btn, "normal" if (not busy and self.undo_stack) else "disabled"),
+            "redo": (self.redo_btn, "normal" if (not busy and self.redo_stack) else "disabled"),
+            "apply_size": (self.apply_size_btn, idle),
+            "size": (self.size_menu, idle),
+            "save": (self.save_btn, idle),
+            "load": (self.load_btn, idle),
+        }
+        current = self._ctrl_state
+        for name, (widget, state) in wanted.items():
+            if current.get(name) != state:
+                widget.config(state=state)
+                current[name] = state
 
     def toggle_ai(self):
         self.ai_enabled = not self.ai_enabled
         self.ai_btn.config(text=f"AI: {'ON' if self.ai_enabled else 'OFF'}")
-        self.redraw()
+        self.schedule_redraw()
         self.maybe_ai_turn()
-        self.autosave()
+        self._mark_dirty()
+
+    def toggle_hints(self):
+        self.show_hints = not self.show_hints
+        self.hints_btn.config(text=f"Hints: {'ON' if self.show_hints else 'OFF'}")
+        self.schedule_redraw()
 
     def apply_board_size(self):
         if self.ai_busy:
@@ -241,144 +633,215 @@ class GoApp:
         if new_size == self.size:
             return
 
-        self.size = new_size
-        self.state = GameState.new(size=self.size)
+        self._cancel_ai()
+        self.state = self._fresh_state(new_size)
         self.undo_stack.clear()
         self.redo_stack.clear()
 
-        self._resize_canvas_for_board()
-        self.redraw()
+        self.change_size(new_size)
+        self.schedule_redraw()
         self.maybe_ai_turn()
-        self.autosave()
+        self._mark_dirty()
 
     def on_new_game(self):
         if self.ai_busy:
             return
-        self.size = int(self.size_var.get())
-        self.state = GameState.new(size=self.size)
+        new_size = int(self.size_var.get())
+        self._cancel_ai()
+        self.state = self._fresh_state(new_size)
         self.undo_stack.clear()
         self.redo_stack.clear()
-        self._resize_canvas_for_board()
-        self.redraw()
+        # Same size: the redraw hides the old stones by diffing boards.
+        if new_size != self.size:
+            self.change_size(new_size)
+        self.schedule_redraw()
         self.maybe_ai_turn()
-        self.autosave()
+        self._mark_dirty()
+
+    def _human_turn(self) -> GameState | None:
+        """Return the current state if the human may move in it now, else None."""
+        state = self.state
+        if state.is_over or self.ai_busy:
+            return None
+        if self.ai_enabled and state.next_player is self.ai_color:
+            return None
+        return state
 
     def on_pass(self):
         """Handle a pass action by the current player."""
-        if self.state.is_over or self.ai_busy:
-            return
-        if self.ai_enabled and self.state.next_player is self.ai_color:
+        state = self._human_turn()
+        if state is None:
             return
 
-        self.push_undo()
-        self.state = self.state.pass_turn()
-        self.redraw()
-        self.autosave()
+        self.push_undo(state.pass_turn())
+        self.schedule_redraw()
+        self._mark_dirty()
         self.maybe_ai_turn()
 
     def on_undo(self):
         """Undo the last move."""
         if self.ai_busy or not self.undo_stack:
             return
-        self.redo_stack.append(self.state)
-        self.state = self.undo_stack.pop()
-        self.redraw()
-        self.autosave()
+        entry = self.undo_stack.pop()
+        self.redo_stack.append(entry.delta)
+        if entry.checkpoint is not None:
+            self.state = entry.checkpoint
+        else:
+            self.state = self.state.revert(entry.delta)
+        self.schedule_redraw()
+        self._mark_dirty()
 
     def on_redo(self):
         """Redo the previously undone move."""
         if self.ai_busy or not self.redo_stack:
             return
-        self.undo_stack.append(self.state)
-        self.state = self.redo_stack.pop()
-        self.redraw()
-        self.autosave()
+        delta = self.redo_stack.pop()
+        before = self.state
+        if delta.point is None:
+            self.state = before.pass_turn()
+        else:
+            self.state = before.play(delta.point)
+        self._record_undo(before, self.state)
+        self.schedule_redraw()
+        self._mark_dirty()
         self.maybe_ai_turn()
 
+    def _ask_path(self, dialog, **options) -> str:
+        """
+            Run a blocking file dialog. Pending autosaves are handed to the
+            io thread first and AI turns are held off while it is open.
+        """
+        self._flush_autosave()
+        self._dialog_open = True
+        try:
+            return dialog(**options)
+        finally:
+            self._dialog_open = False
+
     def on_save(self):
         """Save the current game session to disk."""
         if self.ai_busy:
             return
-        path = filedialog.asksaveasfilename(
+        path = self._ask_path(
+            filedialog.asksaveasfilename,
             title="Save session",
             defaultextension=".json",
             filetypes=[("JSON files", "*.json")],
         )
         if not path:
             return
-        save_session(path, self.state, ai_enabled=self.ai_enabled, ai_color=self.ai_color, board_size=self.size)
-        self.status.config(text="Saved session.")
-        self.root.after(900, self.update_status)
+        fut = self._io_executor.submit(
+            save_session, path, self.state,
+            ai_enabled=self.ai_enabled, ai_color=self.ai_color, board_size=self.size,
+        )
+        self.root.after(20, self._check_save, fut)
+
+    def _check_save(self, fut: Future):
+        """Poll a background save and report its outcome in the status bar."""
+        if not fut.done():
+            self.root.after(20, self._check_save, fut)
+            return
+        exc = fut.exception()
+        if exc is not None:
+            messagebox.showerror("Save failed", str(exc))
+            return
+        self._flash_status("Saved session.")
 
     def on_load(self):
         """Load a previously saved game session."""
         if self.ai_busy:
             return
-        path = filedialog.askopenfilename(
+        path = self._ask_path(
+            filedialog.askopenfilename,
             title="Load session",
             filetypes=[("JSON files", "*.json")],
         )
         if not path:
             return
+        self.root.after_idle(self._load_session, path)
 
+    def _load_session(self, path: str):
         state, ai_enabled, ai_color, size = load_session(path)
+        self._cancel_ai()
         self.state = state
         self.ai_enabled = ai_enabled
         self.ai_color = ai_color
-        self.size = size
         self.size_var.set(str(size))
 
         self.undo_stack.clear()
         self.redo_stack.clear()
 
         self.ai_btn.config(text=f"AI: {'ON' if self.ai_enabled else 'OFF'}")
-        self._resize_canvas_for_board()
-        self.redraw()
-        self.autosave()
+        if size != self.size:
+            self.change_size(size)
+        self.schedule_redraw()
+        self._mark_dirty()
         self.maybe_ai_turn()
 
     def maybe_ai_turn(self):
-        if self.state.is_over:
+        state = self.state
+        if state.is_over:
             return
         if not self.ai_enabled:
             return
-        if self.state.next_player is not self.ai_color:
+        if state.next_player is not self.ai_color:
             return
-        if self.ai_busy:
+        if self.ai_busy or self._dialog_open:
             return
 
         self.ai_busy = True
-        self.status.config(text="AI is thinking...")
-        self.update_controls()
-        self.root.after(150, self.do_ai_turn)
+        self.schedule_redraw()
+        fut = self._ai_executor.submit(self.ai.pick_move, state)
+        self.root.after(20, self._check_ai, fut, state, self._ai_epoch)
 
-    def do_ai_turn(self):
-        try:
-            if self.state.is_over or not self.ai_enabled or self.state.next_player is not self.ai_color:
-                return
-
-            self.push_undo()
+    def _cancel_ai(self):
+        """Discard any AI move still being computed for the current game."""
+        self._ai_epoch += 1
+        self.ai_busy = False
 
-            move = self.ai.pick_move(self.state)
-            if move is None:
-                self.state = self.state.pass_turn()
-            else:
-                self.state = self.state.play(move)
+    def _check_ai(self, fut: Future, state: GameState, epoch: int):
+        """
+            Poll the background AI move until it is ready, then apply it.
+            Tk is not thread-safe, so the worker only works on its immutable
+            state snapshot and never calls into Tk (not even root.after);
+            the Tk thread picks the result up here instead.
+        """
+        if epoch != self._ai_epoch:
+            return
+        if not fut.done():
+            self.root.after(20, self._check_ai, fut, state, epoch)
+            return
+        self._apply_ai_move(state, fut)
 
-        finally:
-            self.ai_busy = False
-            self.redraw()
-            self.autosave()
-            self.maybe_ai_turn()
+    def _apply_ai_move(self, state: GameState, fut: Future):
+        """
+            Play the move computed for `state`, unless the game moved on
+            from that snapshot or the AI was switched off meanwhile.
+        """
+        with self.batch_updates():
+            try:
+                if state is not self.state or not self.ai_enabled:
+                    return
+
+                move = fut.result()
+                if move is None:
+                    self.push_undo(state.pass_turn())
+                else:
+                    self.push_undo(state.play(move))
+
+            finally:
+                self.ai_busy = False
+                self.schedule_redraw()
+                self._mark_dirty()
+                self.maybe_ai_turn()
 
     def on_click(self, event):
         """ Handle mouse clicks on the board.
             Converts pixel coordinates to a board point and attempts
             to play a move.
         """
-        if self.state.is_over or self.ai_busy:
-            return
-        if self.ai_enabled and self.state.next_player is self.ai_color:
+        state = self._human_turn()
+        if state is None:
             return
 
         p = self.xy_to_point(event.x, event.y)
@@ -386,17 +849,14 @@ class GoApp:
             return
 
         try:
-            self.push_undo()
-            self.state = self.state.play(p)
+            new_state = state.play(p)
         except GoError as e:
-            if self.undo_stack and self.undo_stack[-1] == self.state:
-                self.undo_stack.pop()
-            self.status.config(text=f"Illegal move: {e}")
-            self.root.after(900, self.update_status)
+            self._flash_status(f"Illegal move: {e}")
             return
 
-        self.redraw()
-        self.autosave()
+        self.push_undo(new_state)
+        self.schedule_redraw()
+        self._mark_dirty()
         self.maybe_ai_turn()
 
 
@@ -404,3 +864,7 @@ def run_gui(size: int = 9):
     root = tk.Tk()
     GoApp(root, size=size)
     root.mainloop()
+
+
+if __name__ == "__main__":
+    run_gui()
@@ -1,7 +1,29 @@
-from go_game.gui.app import run_gui
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+from go_game.engine.game_state import GameState
+from go_game.engine.mutable_state import MutableGameState
+from go_game.engine.types import Point
+
+
+def replay(size: int, moves: Iterable[Optional[Point]]) -> GameState:
+    """
+    Play `moves` (None = pass) from an empty `size` board and return the
+    final position. The moves are made in place on one MutableGameState
+    and frozen once at the end, so scripts timing a replay measure the
+    rules rather than per-move state copies.
+    """
+    ms = MutableGameState.new(size)
+    for move in moves:
+        ms.apply_move_inplace(move)
+    return ms.to_state()
+
 
 def main():
+    from go_game.gui.app import run_gui
+
     run_gui(size=9)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
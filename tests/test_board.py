@@ -0,0 +1,8 @@
+from go_game.engine.board import Board, changed_indices
+from go_game.engine.types import Color, Point
+
+def test_changed_indices_lists_differing_cells():
+    a = Board.empty(5).place(Point(0, 0), Color.BLACK).place(Point(2, 2), Color.WHITE)
+    b = a.place(Point(4, 4), Color.WHITE).remove_many(1 << 0)
+    assert list(changed_indices(a.grid, b.grid)) == [0, 24]
+    assert list(changed_indices(a.grid, a.grid)) == []
@@ -0,0 +1,79 @@
+import pytest
+from go_game.engine.game_state import GameState
+from go_game.engine.mutable_state import MutableGameState
+from go_game.engine.types import Point
+from go_game.engine.chains import ChainTable
+from go_game.engine.errors import SuicideMove
+
+MOVES = [Point(1, 0), Point(1, 1), Point(0, 1), Point(4, 4), Point(1, 2), Point(4, 3), Point(2, 1)]
+
+def test_matches_immutable_state():
+    gs = GameState.new(5)
+    ms = MutableGameState.new(5)
+    for p in MOVES:
+        gs = gs.play(p)
+        ms.play(p)
+    assert ms.board() == gs.board
+    assert ms.captures_black == gs.captures_black == 1
+    assert ms.legal_moves() == gs.legal_moves()
+    assert ms.to_state().stats() == gs.stats()
+
+def test_chain_table_is_updated_not_rebuilt(monkeypatch):
+    gs = GameState.new(5)
+    ms = MutableGameState.new(5)
+    ms.legal_move_indices()
+    calls = []
+    monkeypatch.setattr(ChainTable, "from_board", staticmethod(lambda board: calls.append(board)))
+    states = [gs]
+    for p in MOVES:
+        states.append(states[-1].play(p))
+        ms.play(p)
+        assert ms.legal_moves() == states[-1].legal_moves()
+    for gs in reversed(states[:-1]):
+        ms.undo()
+        assert ms.legal_moves() == gs.legal_moves()
+    assert calls == []
+
+def test_undo_restores_position():
+    ms = MutableGameState.new(5)
+    start = ms.board()
+    for p in MOVES:
+        ms.play(p)
+    ms.pass_turn()
+    for _ in range(len(MOVES) + 1):
+        ms.undo()
+    assert ms.board() == start
+    assert ms.captures_black == 0 and ms.history == []
+
+def test_illegal_move_leaves_state_untouched():
+    ms = MutableGameState.new(5)
+    for p in [Point(0, 1), Point(4, 4), Point(1, 0)]:
+        ms.play(p)
+    before = ms.board()
+    with pytest.raises(SuicideMove):
+        ms.play(Point(0, 0))  # W
+    assert ms.board() == before and len(ms.undo_stack) == 3
+
+def test_random_playout_in_place_unwinds():
+    from go_game.engine.ai import RandomAI
+    ai = RandomAI()
+    ms = MutableGameState.new(7)
+    start = ms.board()
+    records = []
+    while not ms.is_over and len(records) < 60:
+        records.append(ms.apply_move_inplace(ai.pick_move(ms)))
+    with pytest.raises(ValueError):
+        ms.undo(records[0])
+    for rec in reversed(records):
+        ms.undo(rec)
+    assert ms.board() == start and ms.undo_stack == []
+
+def test_replay_matches_functional_play():
+    from go_game.main import replay
+    gs = GameState.new(5)
+    for p in MOVES:
+        gs = gs.play(p)
+    gs = gs.pass_turn()
+    out = replay(5, MOVES + [None])
+    assert out.board == gs.board and out.stats() == gs.stats()
+    assert out.next_player is gs.next_player and out.consecutive_passes == 1
@@ -1,36 +1,164 @@
+import random
 import pytest
-from go_game.engine.game_state import GameState
-from go_game.engine.types import Point
-from go_game.engine.errors import OccupiedPoint, SuicideMove
+from go_game.engine.ai import RandomAI
+from go_game.engine import game_state
+from go_game.engine.board import Board
+from go_game.engine.game_state import GameState, MoveDelta
+from go_game.engine.rules import apply_move
+from go_game.engine.rules_core import RULES_KERNELS, check_move, NO_KO
+from go_game.engine.serialization import game_to_dict, dict_to_game
+from go_game.engine.types import Color, Point, COLOR_CODE
+from go_game.engine.errors import OutOfBounds, OccupiedPoint, SuicideMove, KoViolation
 
-def test_occupied():
-    gs = GameState.new(5)
-    gs = gs.play(Point(0, 0))
-    with pytest.raises(OccupiedPoint):
-        gs.play(Point(0, 0))
+@pytest.fixture(scope="module")
+def empty5():
+    # GameState is immutable, so one empty board serves every scenario.
+    return GameState.new(5)
+
+@pytest.mark.parametrize("moves, expected_exc, captures_black", [
+    ([Point(0, 0), Point(0, 0)], OccupiedPoint, 0),
+    # B (1,0) (0,1) (1,2) (2,1) surround W (1,1), captured by the last move.
+    ([Point(1, 0), Point(1, 1), Point(0, 1), Point(4, 4),
+      Point(1, 2), Point(4, 3), Point(2, 1)], None, 1),
+    # W playing into B's empty eye at (1,1).
+    ([Point(0, 1), Point(4, 4), Point(1, 0), Point(4, 3),
+      Point(1, 2), Point(3, 3), Point(2, 1), Point(1, 1)], SuicideMove, 0),
+], ids=["occupied", "simple_capture", "suicide_not_allowed"])
+def test_basic_rules(empty5, moves, expected_exc, captures_black):
+    gs = empty5
+    for p in moves[:-1]:
+        gs = gs.play(p)
+    if expected_exc is None:
+        gs = gs.play(moves[-1])
+    else:
+        with pytest.raises(expected_exc):
+            gs.play(moves[-1])
+    assert gs.captures_black == captures_black
 
-def test_simple_capture():
+def test_ko_violation_smoke():
+    # B (1,2) takes W (1,1); W may not retake at once, only after a move elsewhere.
     gs = GameState.new(5)
-    gs = gs.play(Point(1, 0))
-    gs = gs.play(Point(1, 1))
-    gs = gs.play(Point(0, 1))
-    gs = gs.play(Point(4, 4))
-    gs = gs.play(Point(1, 2))
-    gs = gs.play(Point(4, 3))
-    gs = gs.play(Point(2, 1))
+    for p in [Point(0, 1), Point(0, 2), Point(1, 0), Point(1, 1), Point(2, 1),
+              Point(2, 2), Point(4, 4), Point(1, 3), Point(1, 2)]:
+        gs = gs.play(p)
     assert gs.captures_black == 1
+    with pytest.raises(KoViolation):
+        gs.play(Point(1, 1))
+    assert Point(1, 1) not in gs.legal_moves()
+    data = game_to_dict(gs, ai_enabled=False, ai_color=Color.WHITE, board_size=5)
+    loaded, *_ = dict_to_game(data)
+    with pytest.raises(KoViolation):
+        loaded.play(Point(1, 1))
+    later = gs.play(Point(4, 0)).play(Point(3, 4)).play(Point(1, 1))
+    assert later.captures_white == 1 and later.board.get(Point(1, 2)) is None
 
-def test_suicide_not_allowed():
+def test_legal_moves_skip_occupied_and_suicide():
     gs = GameState.new(5)
     gs = gs.play(Point(0, 1))  # B
     gs = gs.play(Point(4, 4))  # W
     gs = gs.play(Point(1, 0))  # B
-    gs = gs.play(Point(4, 3))  # W
-    gs = gs.play(Point(1, 2))  # B
-    gs = gs.play(Point(3, 3))  # W
-    gs = gs.play(Point(2, 1))  # B
-    with pytest.raises(SuicideMove):
-        gs.play(Point(1, 1))
+    legal = gs.legal_moves()   # W to move
+    assert Point(0, 0) not in legal
+    assert Point(0, 1) not in legal
+    assert len(legal) == 25 - 4
 
-def test_ko_violation_smoke():
-    pass
+def test_random_ai_picks_only_legal_moves():
+    ai = RandomAI()
+    gs = GameState.new(size=5)
+    for _ in range(60):
+        move = ai.pick_move(gs)
+        if move is None:
+            gs = gs.pass_turn()
+            continue
+        assert move in gs.legal_moves()
+        gs = gs.play(move)
+
+@pytest.mark.parametrize("size", [9, 13, 19])
+def test_specialized_kernels_match_generic(size):
+    rng = random.Random(size)
+    kernel = RULES_KERNELS[size]
+    gs = GameState.new(size)
+    for ply in range(size * size):
+        if ply % 5 == 0:
+            b = gs.board
+            code = COLOR_CODE[gs.next_player]
+            ko = NO_KO if gs.ko_forbidden_signature is None else gs.ko_forbidden_signature
+            for idx in range(size * size):
+                args = (b.grid, size, idx, code, b.zobrist, ko)
+                assert kernel(*args) == check_move(*args)
+        moves = gs.legal_moves()
+        gs = gs.play(rng.choice(moves)) if moves else gs.pass_turn()
+
+def test_revert_steps_back_over_plays_and_passes():
+    rng = random.Random(3)
+    states = [GameState.new(7)]
+    deltas = []
+    for _ in range(80):
+        gs = states[-1]
+        moves = gs.legal_moves()
+        nxt = gs.play(rng.choice(moves)) if moves and rng.random() < 0.9 else gs.pass_turn()
+        if nxt.is_over:
+            break
+        deltas.append(MoveDelta.between(gs, nxt))
+        states.append(nxt)
+    gs = states[-1]
+    for delta, expected in zip(reversed(deltas), reversed(states[:-1])):
+        gs = gs.revert(delta)
+        assert gs == expected
+        assert gs.legal_moves() == expected.legal_moves()
+
+def test_random_ai_uses_injected_legal_moves():
+    gs = GameState.new(5)
+    assert RandomAI().pick_move(gs, [Point(2, 3)]) == Point(2, 3)
+    assert RandomAI().pick_move(gs, []) is None
+
+def test_legal_moves_are_memoized_per_state():
+    gs = GameState.new(5).play(Point(2, 2))
+    first = gs.legal_move_tuple()
+    assert gs.legal_move_tuple() is first
+    assert gs.legal_moves() == list(first)
+    assert gs.legal_move_indices() == tuple(p.row * 5 + p.col for p in first)
+    assert gs.play(Point(0, 0)).legal_move_tuple() is not first
+
+def test_transposed_states_share_legal_moves():
+    a = GameState.new(5).play(Point(0, 0)).play(Point(4, 4)).play(Point(1, 1))
+    b = GameState.new(5).play(Point(1, 1)).play(Point(4, 4)).play(Point(0, 0))
+    assert a is not b and a.board == b.board
+    assert a.legal_move_tuple() is b.legal_move_tuple()
+
+def test_legal_move_table_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(game_state, "_TT", game_state.OrderedDict())
+    monkeypatch.setattr(game_state, "_TT_LIMIT", 4)
+    first = GameState.new(5).play(Point(0, 0))
+    first.legal_move_tuple()
+    for i in range(1, 10):
+        GameState.new(5).play(Point(i // 5, i % 5)).legal_move_tuple()
+        # Re-reading the first position keeps it the most recently used.
+        GameState.new(5).play(Point(0, 0)).legal_move_tuple()
+    assert len(game_state._TT) == 4
+    assert (first.zobrist, first.next_player, None) in game_state._TT
+
+def test_apply_move_reports_captures_and_errors():
+    # B (0,1) (1,0) (2,1) and W (0,2) (1,3) (2,2) around W (1,1): a ko shape.
+    b = Board.empty(5)
+    for p in [Point(0, 1), Point(1, 0), Point(2, 1)]:
+        b = b.place(p, Color.BLACK)
+    for p in [Point(1, 1), Point(0, 2), Point(1, 3), Point(2, 2)]:
+        b = b.place(p, Color.WHITE)
+    quiet = apply_move(b, Point(4, 4), Color.BLACK)
+    assert quiet.captured == 0 and quiet.captured_points == ()
+    assert quiet.board == b.place(Point(4, 4), Color.BLACK) and b.get(Point(4, 4)) is None
+    res = apply_move(b, Point(1, 2), Color.BLACK)
+    assert res.captured == 1 and res.captured_points == (Point(1, 1),)
+    assert res.board == b.place(Point(1, 2), Color.BLACK).remove_many(1 << b.index(Point(1, 1)))
+    assert res.board.zobrist == Board.from_grid(5, res.board.grid).zobrist
+    with pytest.raises(KoViolation):
+        apply_move(res.board, Point(1, 1), Color.WHITE, ko_forbidden_signature=b.zobrist)
+    assert apply_move(res.board, Point(1, 1), Color.WHITE).board == b
+    with pytest.raises(OccupiedPoint):
+        apply_move(b, Point(1, 1), Color.BLACK)
+    with pytest.raises(OutOfBounds):
+        apply_move(b, Point(5, 0), Color.BLACK)
+    corner = Board.empty(5).place(Point(0, 1), Color.BLACK).place(Point(1, 0), Color.BLACK)
+    with pytest.raises(SuicideMove):
+        apply_move(corner, Point(0, 0), Color.WHITE)
@@ -0,0 +1,11 @@
+from go_game.engine.board import Board
+from go_game.engine.scoring import evaluate_territory
+from go_game.engine.types import Color, Point
+
+def test_territory_split_by_wall():
+    b = Board.empty(5)
+    for r in range(5):
+        b = b.place(Point(r, 1), Color.BLACK)
+        b = b.place(Point(r, 3), Color.WHITE)
+    terr = evaluate_territory(b)
+    assert (terr.territory_black, terr.territory_white, terr.neutral) == (5, 5, 5)
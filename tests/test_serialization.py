@@ -0,0 +1,38 @@
+from go_game.engine.game_state import GameState
+from go_game.engine.serialization import game_to_dict, dict_to_game
+from go_game.engine.types import Color, Point
+
+def _sample_game():
+    gs = GameState.new(5)
+    for p in [Point(1, 0), Point(1, 1), Point(0, 1), Point(4, 4), Point(1, 2), Point(4, 3), Point(2, 1)]:
+        gs = gs.play(p)
+    return gs.pass_turn()
+
+def test_snapshot_roundtrip():
+    gs = _sample_game()
+    data = game_to_dict(gs, ai_enabled=True, ai_color=Color.WHITE, board_size=5)
+    assert data["version"] == 2
+    loaded, ai_enabled, ai_color, size = dict_to_game(data)
+    assert (ai_enabled, ai_color, size) == (True, Color.WHITE, 5)
+    assert loaded.board == gs.board
+    assert loaded.next_player is gs.next_player
+    assert loaded.captures_black == 1
+    assert loaded.stats() == gs.stats()
+    assert list(loaded.iter_history()) == list(gs.iter_history())
+
+def test_version1_history_is_replayed():
+    gs = _sample_game()
+    data = game_to_dict(gs, ai_enabled=False, ai_color=Color.BLACK, board_size=5)
+    del data["position"]
+    data["version"] = 1
+    loaded, *_ = dict_to_game(data)
+    assert loaded.board == gs.board
+    assert loaded.legal_moves() == gs.legal_moves()
+
+def test_equal_games_compare_and_hash_alike():
+    gs = _sample_game()
+    again = _sample_game()
+    assert gs == again and hash(gs) == hash(again)
+    data = game_to_dict(gs, ai_enabled=False, ai_color=Color.BLACK, board_size=5)
+    loaded, *_ = dict_to_game(data)
+    assert loaded == gs and hash(loaded) == hash(gs)